@@ -4,11 +4,19 @@ Falls back to Rich Prompt when not attached to a TTY or when curses
 is unavailable. Designed to keep dependencies minimal.
 """
 
+from functools import lru_cache
 from typing import List, Optional
 import sys
 import os
 
 
+@lru_cache(maxsize=1024)
+def _format_choice(item: str, selected: bool) -> str:
+    """Build the display line for a choice; reused across redraws."""
+    prefix = "➤ " if selected else "  "
+    return f"{prefix}{item}"
+
+
 def select(prompt: str, choices: List[str], default: Optional[str] = None) -> str:
     """Select one item from a list with arrow keys.
 
@@ -35,46 +43,84 @@ def select(prompt: str, choices: List[str], default: Optional[str] = None) -> st
                 curses.curs_set(0)
                 stdscr.keypad(True)
                 current = default_idx
+                top = 0
+                start_row = 2
+                h, w = stdscr.getmaxyx()
+                visible_height = max(1, h - start_row - 1)
+
+                # Every choice lives in an off-screen pad, written once; a
+                # keypress only rewrites the rows whose highlight changed and
+                # scrolling just moves the pad viewport.
+                pad_width = max(len(c) for c in choices) + 4
+                pad = curses.newpad(len(choices) + 1, pad_width)
+
+                def _draw_row(idx):
+                    line = _format_choice(choices[idx], idx == current)
+                    pad.move(idx, 0)
+                    pad.clrtoeol()
+                    if idx == current:
+                        pad.attron(curses.A_REVERSE)
+                        pad.addstr(idx, 0, line)
+                        pad.attroff(curses.A_REVERSE)
+                    else:
+                        pad.addstr(idx, 0, line)
+
+                def _draw_prompt():
+                    stdscr.erase()
+                    stdscr.addstr(0, 0, f"{prompt}"[: w - 1])
+                    stdscr.noutrefresh()
+
+                for idx in range(len(choices)):
+                    _draw_row(idx)
+                _draw_prompt()
+
+                # Only repaint when the highlight or viewport changed
+                dirty = True
+                prev_current = current
 
                 while True:
-                    stdscr.clear()
-                    # Render prompt
-                    stdscr.addstr(0, 0, f"{prompt}")
-                    # Render choices
-                    start_row = 2
-                    h, w = stdscr.getmaxyx()
-                    visible_height = max(1, h - start_row - 1)
-
-                    # Basic scrolling support when many options
-                    top = 0
+                    # Keep the highlighted row inside the visible window
                     if current >= top + visible_height:
                         top = current - visible_height + 1
                     if current < top:
                         top = current
 
-                    for idx, item in enumerate(choices[top : top + visible_height]):
-                        actual_idx = top + idx
-                        prefix = "➤ " if actual_idx == current else "  "
-                        line = f"{prefix}{item}"
-                        if actual_idx == current:
-                            stdscr.attron(curses.A_REVERSE)
-                            stdscr.addstr(start_row + idx, 0, line[: w - 1])
-                            stdscr.attroff(curses.A_REVERSE)
-                        else:
-                            stdscr.addstr(start_row + idx, 0, line[: w - 1])
-
-                    stdscr.refresh()
-
+                    if current != prev_current:
+                        _draw_row(prev_current)
+                        _draw_row(current)
+                        prev_current = current
+                        dirty = True
+
+                    if dirty:
+                        pad.noutrefresh(
+                            top, 0, start_row, 0, start_row + visible_height - 1, w - 1
+                        )
+                        curses.doupdate()
+                        dirty = False
+
+                    # Block for the first key, then drain anything already
+                    # queued (e.g. a held arrow) so a burst renders once.
                     key = stdscr.getch()
-                    if key in (curses.KEY_UP, ord("k")):
-                        current = (current - 1) % len(choices)
-                    elif key in (curses.KEY_DOWN, ord("j")):
-                        current = (current + 1) % len(choices)
-                    elif key in (curses.KEY_ENTER, ord("\n"), ord("\r")):
-                        return choices[current]
-                    elif key in (27,):  # ESC
-                        # Return default or current selection on ESC
-                        return choices[default_idx]
+                    stdscr.nodelay(True)
+                    try:
+                        while key != -1:
+                            if key == getattr(curses, "KEY_RESIZE", None):
+                                h, w = stdscr.getmaxyx()
+                                visible_height = max(1, h - start_row - 1)
+                                _draw_prompt()
+                                dirty = True
+                            elif key in (curses.KEY_UP, ord("k")):
+                                current = (current - 1) % len(choices)
+                            elif key in (curses.KEY_DOWN, ord("j")):
+                                current = (current + 1) % len(choices)
+                            elif key in (curses.KEY_ENTER, ord("\n"), ord("\r")):
+                                return choices[current]
+                            elif key in (27,):  # ESC
+                                # Return default or current selection on ESC
+                                return choices[default_idx]
+                            key = stdscr.getch()
+                    finally:
+                        stdscr.nodelay(False)
 
             return curses.wrapper(_curses_main)
         except Exception:
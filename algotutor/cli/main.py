@@ -4,35 +4,191 @@ import click
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.markdown import Markdown
-from typing import Optional, Dict, Any
+from rich.segment import Segments
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Set, Tuple
+from functools import lru_cache
+import hashlib
 import os
 import shlex
 import shutil
 import ast
+import io
+import json
+import re
+import sys
 import tempfile
 
-from algotutor.services.database import db_service
-from algotutor.services.llm import llm_service
-from algotutor.services.execution import code_execution_service
-from algotutor.services.curriculum import curriculum_service
-from algotutor.models import User, Problem, Attempt
 from algotutor.cli.interactive import select as interactive_select
 
+if TYPE_CHECKING:
+    from algotutor.models import User, Problem, Attempt
+
 console = Console()
 
+# "<buffer>:LINE:COL: message" lines emitted by pyflakes' Reporter
+_PYFLAKES_LINE = re.compile(r"^<buffer>:(\d+):(?:\d+:)?\s*(.*)$")
+
+
+@lru_cache(maxsize=32)
+def _render_syntax(code: str, theme: str, line_numbers: bool, width: int) -> Segments:
+    """Highlight Python source once and keep the rendered segments.
+
+    Rich's Syntax re-runs the Pygments lexer every time it is printed, so
+    the rendered output is cached instead, keyed by content and width.
+    """
+    from rich.syntax import Syntax
+
+    syntax = Syntax(code, "python", theme=theme, line_numbers=line_numbers, tab_size=4)
+    return Segments(console.render(syntax, console.options.update(width=width)))
+
+
+# The LLM service pulls in the OpenAI SDK, the database service pulls in
+# SQLAlchemy, and the execution and curriculum services are only needed for
+# some commands, so import them on first use; --help never loads any of them.
+@lru_cache(maxsize=None)
+def _db():
+    from algotutor.services.database import db_service
+
+    return db_service
+
+
+@lru_cache(maxsize=None)
+def _llm():
+    from algotutor.services.llm import llm_service
+
+    return llm_service
+
+
+@lru_cache(maxsize=None)
+def _executor():
+    from algotutor.services.execution import code_execution_service
+
+    return code_execution_service
+
+
+@lru_cache(maxsize=64)
+def _render_markdown_panel(text: str, title: str, border_style: str, width: int) -> Segments:
+    """Parse and lay out a Markdown panel once, keyed by content and width."""
+    from rich.markdown import Markdown
+
+    panel = Panel(Markdown(text), title=title, border_style=border_style)
+    return Segments(console.render(panel, console.options.update(width=width)))
+
+
+def _partial_json_string(text: str, field: str) -> str:
+    """Best-effort value of string ``field`` from a possibly truncated JSON object."""
+    match = re.search(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)' % re.escape(field), text)
+    if not match:
+        return ""
+    raw = match.group(1)
+    # Drop a dangling escape cut off mid-stream before decoding
+    raw = re.sub(r"\\(u[0-9a-fA-F]{0,3})?$", "", raw)
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+def _digest(text: str) -> str:
+    """Short, stable content digest used to detect unchanged buffers."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _hl(code: str, theme: str = "monokai", line_numbers: bool = True) -> Segments:
+    """Return a highlighted rendering of ``code`` for the current console width."""
+    return _render_syntax(code, theme, line_numbers, console.width)
+
+
+@lru_cache(maxsize=None)
+def _path_exes() -> frozenset:
+    """Names of executable files on $PATH, scanned once per process."""
+    names = set()
+    for d in os.environ.get("PATH", "").split(os.pathsep):
+        d = d or "."
+        try:
+            entries = os.listdir(d)
+        except OSError:
+            continue
+        for name in entries:
+            # Same test ``shutil.which`` applies to each candidate
+            path = os.path.join(d, name)
+            if os.path.isfile(path) and os.access(path, os.X_OK):
+                names.add(name)
+    return frozenset(names)
+
+
+def _on_path(exe: str) -> bool:
+    """Cheap ``shutil.which`` replacement backed by the cached PATH scan."""
+    if os.path.dirname(exe):
+        return os.path.isfile(exe) and os.access(exe, os.X_OK)
+    if os.name == "nt":
+        # PATHEXT resolution is not worth replicating here
+        return shutil.which(exe) is not None
+    return exe in _path_exes()
+
+
+@lru_cache(maxsize=8)
+def _resolve_editor(
+    configured: Optional[str], env_visual: Optional[str], env_editor: Optional[str]
+) -> Optional[str]:
+    """Resolve the editor command for the given settings/environment values."""
+    candidates: list[str] = []
+    if configured:
+        candidates.append(configured)
+    if env_visual:
+        candidates.append(env_visual)
+    if env_editor:
+        candidates.append(env_editor)
+
+    # Common fallbacks by preference
+    candidates.extend([
+        "code -w",  # VS Code
+        "cursor -w",  # Cursor editor
+        "nvim",
+        "vim",
+        "nano",
+        "vi",
+    ])
+
+    for cmd in candidates:
+        # Extract executable for the PATH lookup
+        exe = shlex.split(cmd)[0] if cmd else ""
+        if exe and _on_path(exe):
+            # Ensure VS Code waits
+            if exe in {"code", "cursor"} and "-w" not in cmd:
+                cmd = f"{cmd} -w"
+            return cmd
+    return None
+
 
 class TutorSession:
     """Interactive tutoring session manager."""
 
-    def __init__(self, user: User):
+    def __init__(self, user: "User"):
         self.user = user
-        self.current_problem: Optional[Problem] = None
-        self.current_attempt: Optional[Attempt] = None
+        self.current_problem: Optional["Problem"] = None
+        self.current_attempt: Optional["Attempt"] = None
         self.hint_level = 0
+        # Problem context sent ahead of the code in every LLM request
+        self._problem_prefix = ""
+        # Batched LLM responses, keyed by (code digest, problem id, hint level)
+        self._bundle_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        # Last (code, sanitized code) pair and last (code, parsed module) pair
+        self._sanitized_cache: Tuple[str, str] = ("", "")
+        self._parsed_cache: Tuple[str, Optional[ast.Module]] = ("", None)
+        # Scratch file reused by every editor invocation in this session
+        self._editor_path: Optional[str] = None
+        # Digest of the last buffer produced by Black
+        self._last_black_hash: Optional[str] = None
+        # Attempt column updates not yet written to the database
+        self._pending_updates: Dict[str, Any] = {}
+        # Problem catalog, loaded once per session; the curriculum is static
+        self._all_problems: Optional[List[Any]] = None
+        self._categories: List[str] = []
+        self._problems_by_category: Dict[str, List[Any]] = {}
+        self._title_to_problem: Dict[Tuple[str, str], Any] = {}
+        # IDs of problems this user has solved, kept current by submit_solution
+        self._solved_ids: Optional[Set[int]] = None
 
     def start_session(self):
         """Start an interactive learning session."""
@@ -44,41 +200,61 @@ class TutorSession:
             )
         )
 
-        while True:
-            choice = Prompt.ask(
-                "\nWhat would you like to do?",
-                choices=["solve", "pick", "review", "progress", "quit"],
-                default="solve",
-            )
+        try:
+            while True:
+                choice = Prompt.ask(
+                    "\nWhat would you like to do?",
+                    choices=["solve", "pick", "review", "progress", "quit"],
+                    default="solve",
+                )
 
-            if choice == "solve":
-                # Default quick-start problem (Arrays and Strings → first)
-                self.solve_problem()
-            elif choice == "pick":
-                problem = self.pick_problem()
-                if problem:
-                    self.current_problem = problem
+                if choice == "solve":
+                    # Default quick-start problem (Arrays and Strings → first)
                     self.solve_problem()
-            elif choice == "review":
-                self.review_progress()
-            elif choice == "progress":
-                self.show_progress()
-            elif choice == "quit":
-                console.print("[yellow]Happy learning! See you next time! 👋[/yellow]")
-                break
+                elif choice == "pick":
+                    problem = self.pick_problem()
+                    if problem:
+                        self.current_problem = problem
+                        self.solve_problem()
+                elif choice == "review":
+                    self.review_progress()
+                elif choice == "progress":
+                    self.show_progress()
+                elif choice == "quit":
+                    console.print("[yellow]Happy learning! See you next time! 👋[/yellow]")
+                    break
+        finally:
+            # Also on Ctrl-C or EOF, so the scratch file is never left behind
+            self._remove_editor_buffer()
+
+    def _editor_buffer_path(self) -> str:
+        """Return the session's editor scratch file, creating it on first use."""
+        if self._editor_path is None:
+            with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as tf:
+                self._editor_path = tf.name
+        return self._editor_path
+
+    def _remove_editor_buffer(self):
+        """Delete the editor scratch file, if one was created."""
+        if self._editor_path is not None:
+            try:
+                os.unlink(self._editor_path)
+            except OSError:
+                pass
+            self._editor_path = None
 
     def solve_problem(self):
         """Interactive problem solving with LLM guidance."""
         # If no problem pre-selected, find the next unsolved problem
         if not self.current_problem:
-            all_problems = db_service.get_all_problems()
+            all_problems = self._problem_catalog()
             if not all_problems:
                 console.print(
                     "[red]No problems available. Please initialize the curriculum first.[/red]"
                 )
                 return
 
-            solved_problem_ids = db_service.get_solved_problem_ids(self.user.id)
+            solved_problem_ids = self._solved_problem_ids()
 
             next_unsolved_problem = None
             for problem in all_problems:
@@ -93,36 +269,66 @@ class TutorSession:
                 self.current_problem = None  # Ensure no problem is carried over
                 return
 
-            self.current_problem = next_unsolved_problem
+            self.current_problem = _db().get_problem(next_unsolved_problem.id)
         self.hint_level = 0
+        # Built once per problem so the request prefix stays byte-identical
+        from algotutor.services.llm import build_static_context
+
+        self._problem_prefix = build_static_context(self.current_problem)
 
         # Display problem
         self.display_problem()
 
         # Interactive coding loop
-        while True:
-            action = Prompt.ask(
-                "\nWhat would you like to do?",
-                choices=["code", "format", "lint", "hint", "submit", "skip", "back"],
-                default="code",
-            )
+        try:
+            while True:
+                action = Prompt.ask(
+                    "\nWhat would you like to do?",
+                    choices=["code", "format", "lint", "hint", "submit", "skip", "back"],
+                    default="code",
+                )
 
-            if action == "code":
-                self.code_editor()
-            elif action == "format":
-                self.format_code()
-            elif action == "lint":
-                self.lint_code()
-            elif action == "hint":
-                self.get_hint()
-            elif action == "submit":
-                if self.submit_solution():
+                if action == "code":
+                    self.code_editor()
+                elif action == "format":
+                    self.format_code()
+                elif action == "lint":
+                    self.lint_code()
+                elif action == "hint":
+                    self.get_hint()
+                elif action == "submit":
+                    if self.submit_solution():
+                        break
+                elif action == "skip":
+                    console.print("[yellow]Skipping this problem. Try another one![/yellow]")
                     break
-            elif action == "skip":
-                console.print("[yellow]Skipping this problem. Try another one![/yellow]")
-                break
-            elif action == "back":
-                break
+                elif action == "back":
+                    break
+        finally:
+            # Queued edits are written even if the loop is interrupted
+            self._flush_attempt()
+
+    def _save_code(self, code: str):
+        """Record new code for the current attempt.
+
+        The first save creates the attempt row; later edits are queued in
+        ``_pending_updates`` and written by ``_flush_attempt``.
+        """
+        if self.current_attempt is None:
+            self.current_attempt = _db().create_attempt(
+                user_id=self.user.id,
+                problem_id=self.current_problem.id,
+                code=code,
+            )
+        else:
+            self.current_attempt.code = code
+            self._pending_updates["code"] = code
+
+    def _flush_attempt(self):
+        """Write all pending attempt changes in a single update."""
+        if self.current_attempt is not None and self._pending_updates:
+            _db().update_attempt(self.current_attempt.id, **self._pending_updates)
+        self._pending_updates.clear()
 
     def display_problem(self):
         """Display the current problem details."""
@@ -138,26 +344,17 @@ class TutorSession:
         )
         console.print(f"[dim]Patterns: {', '.join(problem.patterns)}[/dim]\n")
 
-        # Problem description
+        # Problem description (rendered once per text and width)
         console.print(
-            Panel(
-                Markdown(problem.description),
-                title="📋 Problem Description",
-                border_style="blue",
+            _render_markdown_panel(
+                problem.description, "📋 Problem Description", "blue", console.width
             )
         )
 
         # Template code
         if problem.solution_template:
             console.print("\n[bold]Starting Template:[/bold]")
-            syntax = Syntax(
-                problem.solution_template,
-                "python",
-                theme="monokai",
-                line_numbers=True,
-                tab_size=4,
-            )
-            console.print(syntax)
+            console.print(_hl(problem.solution_template))
 
     def code_editor(self):
         """Open system editor for code entry, with fallback."""
@@ -180,10 +377,19 @@ class TutorSession:
         editor_cmd = self._select_editor()
         if editor_cmd:
             try:
-                # require_save=False returns content even if unchanged
-                edited = click.edit(
-                    initial, extension=".py", editor=editor_cmd, require_save=False
-                )
+                # Edit the session's buffer file in place and read it back,
+                # even if unchanged, instead of a fresh temp file per edit
+                path = self._editor_buffer_path()
+                data = initial.encode("utf-8")
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+                try:
+                    os.write(fd, data)
+                    os.ftruncate(fd, len(data))
+                finally:
+                    os.close(fd)
+                click.edit(filename=path, editor=editor_cmd)
+                with open(path, "r", encoding="utf-8") as f:
+                    edited = f.read()
             except Exception as e:
                 console.print(
                     f"[red]Failed to open external editor '{editor_cmd}': {e}[/red]"
@@ -195,24 +401,7 @@ class TutorSession:
 
         # If editor was aborted or failed, fall back to simple inline input
         if edited is None:
-            console.print(
-                "[yellow]Editor aborted. Falling back to inline entry. Press Enter twice to finish.[/yellow]"
-            )
-            code_lines = []
-            empty_lines = 0
-            while empty_lines < 2:
-                try:
-                    line = input(">>> " if not code_lines else "... ")
-                except (EOFError, KeyboardInterrupt):
-                    break
-                if line.strip() == "":
-                    empty_lines += 1
-                else:
-                    empty_lines = 0
-                code_lines.append(line)
-            while code_lines and code_lines[-1].strip() == "":
-                code_lines.pop()
-            edited = "\n".join(code_lines)
+            edited = self._read_inline_code()
 
         code = (edited or "").rstrip()
         if not code.strip():
@@ -222,8 +411,8 @@ class TutorSession:
         # Optional: pre-parse to catch obvious syntax issues early
         try:
             # Sanitize first to avoid tab/space mix false positives
-            code_for_check = code_execution_service.sanitize_code(code)
-            ast.parse(code_for_check)
+            code_for_check = self._sanitize(code)
+            self._parse(code)
         except SyntaxError as e:
             console.print(
                 Panel(
@@ -233,23 +422,9 @@ class TutorSession:
                 )
             )
             # Show a snippet for context
-            syntax = Syntax(
-                code_for_check,
-                "python",
-                theme="monokai",
-                line_numbers=True,
-                tab_size=4,
-            )
-            console.print(syntax)
+            console.print(_hl(code_for_check))
             # Save the problematic code to the current attempt so it's preserved if the user re-opens the editor
-            if self.current_attempt is None:
-                self.current_attempt = db_service.create_attempt(
-                    user_id=self.user.id,
-                    problem_id=self.current_problem.id,
-                    code=code,
-                )
-            else:
-                db_service.update_attempt(self.current_attempt.id, code=code)
+            self._save_code(code)
 
             if Confirm.ask("Open editor to fix it?", default=True):
                 return self.code_editor()
@@ -258,42 +433,90 @@ class TutorSession:
                 return
 
         # Create or update attempt
-        if self.current_attempt is None:
-            self.current_attempt = db_service.create_attempt(
-                user_id=self.user.id,
-                problem_id=self.current_problem.id,
-                code=code,
-            )
-        else:
-            db_service.update_attempt(self.current_attempt.id, code=code)
+        self._save_code(code)
 
         # Show code with syntax highlighting
         console.print("\n[bold]Your Code:[/bold]")
-        syntax = Syntax(code, "python", theme="monokai", line_numbers=True, tab_size=4)
-        console.print(syntax)
+        console.print(_hl(code))
 
         # Get Socratic question from LLM
         self.provide_socratic_feedback(code)
 
-    def pick_problem(self) -> Optional[Problem]:
+    def _read_inline_code(self) -> str:
+        """Read code typed or pasted at the terminal.
+
+        On a TTY the whole block is read in one call, terminated by EOF.
+        When stdin is piped it also carries the menu answers that follow,
+        so the line-by-line two-blank-lines heuristic is kept there.
+        """
+        if sys.stdin.isatty():
+            eof_key = "Ctrl-Z then Enter" if os.name == "nt" else "Ctrl-D"
+            console.print(
+                f"[yellow]Editor aborted. Falling back to inline entry. Paste or type your code, then press {eof_key} to finish.[/yellow]"
+            )
+            try:
+                return sys.stdin.read().rstrip()
+            except KeyboardInterrupt:
+                return ""
+
+        console.print(
+            "[yellow]Editor aborted. Falling back to inline entry. Press Enter twice to finish.[/yellow]"
+        )
+        code_lines = []
+        empty_lines = 0
+        while empty_lines < 2:
+            try:
+                line = input(">>> " if not code_lines else "... ")
+            except (EOFError, KeyboardInterrupt):
+                break
+            if line.strip() == "":
+                empty_lines += 1
+            else:
+                empty_lines = 0
+            code_lines.append(line)
+        while code_lines and code_lines[-1].strip() == "":
+            code_lines.pop()
+        return "\n".join(code_lines)
+
+    def _problem_catalog(self) -> List[Any]:
+        """Load every problem summary once and index it by category and title."""
+        if self._all_problems is None:
+            problems = _db().list_problem_summaries()
+            if not problems:
+                return []  # Retry after the curriculum is initialized
+            self._all_problems = problems
+            # Categories in catalog order; problems within one in creation order
+            for p in sorted(problems, key=lambda p: p.id):
+                if p.category:
+                    self._problems_by_category.setdefault(p.category, []).append(p)
+                    self._title_to_problem.setdefault((p.category, p.title), p)
+            self._categories = sorted(self._problems_by_category)
+        return self._all_problems
+
+    def _solved_problem_ids(self) -> Set[int]:
+        if self._solved_ids is None:
+            self._solved_ids = set(_db().get_solved_problem_ids(self.user.id))
+        return self._solved_ids
+
+    def pick_problem(self) -> Optional["Problem"]:
         """Let the user choose a category and problem to solve."""
-        categories = db_service.list_problem_categories()
+        self._problem_catalog()
+        categories = self._categories
         if not categories:
             console.print(
                 "[red]No problems available. Please initialize the curriculum first.[/red]"
             )
             return None
         category = interactive_select("Choose a category", categories, default=categories[0])
-        problems = db_service.get_problems_by_category(category)
+        problems = self._problems_by_category.get(category)
         if not problems:
             console.print("[red]No problems in that category.[/red]")
             return None
         titles = [p.title for p in problems]
         selected_title = interactive_select("Choose a problem", titles, default=titles[0])
-        for p in problems:
-            if p.title == selected_title:
-                return p
-        return problems[0]
+        summary = self._title_to_problem.get((category, selected_title), problems[0])
+        # The catalog only holds listing columns; load the full row now
+        return _db().get_problem(summary.id)
 
     def _select_editor(self) -> Optional[str]:
         """Pick an editor command to use with click.edit.
@@ -305,46 +528,96 @@ class TutorSession:
         # Prefer explicit setting
         from algotutor.core.config import settings
 
-        candidates: list[str] = []
-        if settings.editor_command:
-            candidates.append(settings.editor_command)
-
-        env_visual = os.environ.get("VISUAL")
-        env_editor = os.environ.get("EDITOR")
-        if env_visual:
-            candidates.append(env_visual)
-        if env_editor:
-            candidates.append(env_editor)
-
-        # Common fallbacks by preference
-        candidates.extend([
-            "code -w",  # VS Code
-            "cursor -w",  # Cursor editor
-            "nvim",
-            "vim",
-            "nano",
-            "vi",
-        ])
-
-        for cmd in candidates:
-            # Extract executable for which()
-            exe = shlex.split(cmd)[0] if cmd else ""
-            if exe and shutil.which(exe):
-                # Ensure VS Code waits
-                if exe in {"code", "cursor"} and "-w" not in cmd:
-                    cmd = f"{cmd} -w"
-                return cmd
-        return None
+        return _resolve_editor(
+            settings.editor_command, os.environ.get("VISUAL"), os.environ.get("EDITOR")
+        )
 
-    def provide_socratic_feedback(self, code: str):
-        """Provide Socratic questioning feedback."""
-        with console.status("[dim]Analyzing your code...[/dim]"):
-            question = llm_service.generate_socratic_question(
+    def _sanitize(self, code: str) -> str:
+        """Sanitize ``code``, reusing the previous result for an unchanged buffer."""
+        if self._sanitized_cache[0] != code:
+            self._sanitized_cache = (code, _executor().sanitize_code(code))
+        return self._sanitized_cache[1]
+
+    def _parse(self, code: str) -> ast.Module:
+        """Parse the sanitized ``code``, reusing the previous tree when unchanged.
+
+        Raises SyntaxError like ``ast.parse``.
+        """
+        cached_code, tree = self._parsed_cache
+        if tree is None or cached_code != code:
+            tree = ast.parse(self._sanitize(code))
+            self._parsed_cache = (code, tree)
+        return tree
+
+    def _with_status(self, desc: str, fn, *args, **kwargs):
+        """Run ``fn`` under a single spinner; only real LLM round-trips need one."""
+        with console.status(desc):
+            return fn(*args, **kwargs)
+
+    @property
+    def _bundle_hint_level(self) -> int:
+        """Hint level sent with bundle requests; level 0 asks for level 1."""
+        return max(1, self.hint_level)
+
+    def _bundle_key(self, code: str) -> Tuple[str, int, int]:
+        return (_digest(code), self.current_problem.id, self._bundle_hint_level)
+
+    def _llm_bundle(self, code: str) -> Dict[str, Any]:
+        """Fetch the batched LLM response for ``code``, requesting it at most once.
+
+        The Socratic question, hint and detailed feedback share one request;
+        later lookups for the same code, problem and hint level hit the
+        in-memory cache, and repeats across sessions hit the LLM response cache.
+        """
+        key = self._bundle_key(code)
+        bundle = self._bundle_cache.get(key)
+        if bundle is None:
+            bundle = self._with_status(
+                "[dim]Analyzing your code...[/dim]",
+                _llm().generate_bundle,
+                code=code,
+                problem=self._problem_prefix,
+                hint_level=self._bundle_hint_level,
+            )
+            self._bundle_cache[key] = bundle
+        return bundle
+
+    def _stream_socratic_bundle(self, code: str) -> Dict[str, Any]:
+        """Fetch the bundle while showing the Socratic question as it streams in."""
+        from rich.live import Live
+        from rich.markup import escape
+
+        received: List[str] = []
+        placeholder = Panel("[dim]Thinking...[/dim]", title="🤔 Think About This", border_style="green")
+        # Transient: the finished question is printed normally afterwards
+        with Live(placeholder, console=console, refresh_per_second=12, transient=True) as live:
+
+            def on_delta(delta: str) -> None:
+                received.append(delta)
+                partial = _partial_json_string("".join(received), "socratic_question")
+                if partial:
+                    live.update(
+                        Panel(
+                            f"[italic]{escape(partial)}[/italic]",
+                            title="🤔 Think About This",
+                            border_style="green",
+                        )
+                    )
+
+            return _llm().generate_bundle_stream(
                 code=code,
-                problem=self.current_problem.description,
-                context="Student is working on their solution",
+                problem=self._problem_prefix,
+                hint_level=self._bundle_hint_level,
+                on_delta=on_delta,
             )
 
+    def provide_socratic_feedback(self, code: str):
+        """Provide Socratic questioning feedback."""
+        key = self._bundle_key(code)
+        if key not in self._bundle_cache and _llm().client is not None:
+            self._bundle_cache[key] = self._stream_socratic_bundle(code)
+        question = self._llm_bundle(code).get("socratic_question", "")
+
         console.print(
             Panel(
                 f"[italic]{question}[/italic]",
@@ -363,25 +636,24 @@ class TutorSession:
             console.print("[yellow]No code to format. Use 'code' first.[/yellow]")
             return
         code = self.current_attempt.code
+        # Skip Black entirely when the buffer is exactly what it last produced
+        code_hash = _digest(code)
+        if code_hash == self._last_black_hash:
+            console.print("[green]Code already well-formatted.[/green]")
+            console.print(_hl(code))
+            return
         try:
             import black
 
             mode = black.Mode()  # respects pyproject defaults
             formatted = black.format_str(code, mode=mode)
             if formatted != code:
-                db_service.update_attempt(self.current_attempt.id, code=formatted)
-                self.current_attempt.code = formatted
+                self._save_code(formatted)
                 console.print("[green]Code formatted with Black.[/green]")
             else:
                 console.print("[green]Code already well-formatted.[/green]")
-            syntax = Syntax(
-                self.current_attempt.code,
-                "python",
-                theme="monokai",
-                line_numbers=True,
-                tab_size=4,
-            )
-            console.print(syntax)
+            self._last_black_hash = _digest(formatted)
+            console.print(_hl(self.current_attempt.code))
         except Exception as e:
             console.print(
                 Panel(
@@ -392,66 +664,63 @@ class TutorSession:
             )
 
     def lint_code(self):
-        """Lint the current code. Uses flake8 if available, else basic checks."""
+        """Lint the current code. Uses pyflakes if available, plus basic style checks."""
         if not self.current_attempt or not (self.current_attempt.code or "").strip():
             console.print("[yellow]No code to lint. Use 'code' first.[/yellow]")
             return
         code = self.current_attempt.code
 
-        # Try flake8 API first
-        try:
-            from flake8.api import legacy as flake8
-
-            style_guide = flake8.get_style_guide(max_line_length=88)
-            with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as tf:
-                tf.write(code)
-                tmp_path = tf.name
-            report = style_guide.check_files([tmp_path])
-            os.unlink(tmp_path)
-            if report.total_errors == 0:
-                console.print(Panel("No lint issues found.", title="🧹 Lint", border_style="green"))
-            else:
-                console.print(
-                    Panel(
-                        f"Found {report.total_errors} issue(s). (See above)",
-                        title="🧹 Lint",
-                        border_style="yellow",
-                    )
-                )
-                syntax = Syntax(code, "python", theme="monokai", line_numbers=True, tab_size=4)
-                console.print(syntax)
-            return
-        except Exception:
-            pass
-
-        # Basic fallback checks
         issues = []
+
+        # Check the buffer in-process with pyflakes (no temp file, no plugin discovery)
+        flakes_available = True
+        try:
+            from pyflakes.api import check as pyflakes_check
+            from pyflakes.reporter import Reporter
+
+            buf = io.StringIO()
+            pyflakes_check(code, "<buffer>", reporter=Reporter(buf, buf))
+            for entry in buf.getvalue().splitlines():
+                match = _PYFLAKES_LINE.match(entry)
+                if match:
+                    issues.append((int(match.group(1)), "FLAKES", match.group(2)))
+        except ImportError:
+            flakes_available = False
+
+        # Basic style checks on the in-memory string
         lines = code.splitlines()
         for i, ln in enumerate(lines, 1):
             if "\t" in ln[: len(ln) - len(ln.lstrip())]:
                 issues.append((i, "TABS", "Indentation uses tabs; prefer 4 spaces."))
-            if len(ln) > 100:
-                issues.append((i, "LINE", f"Line too long ({len(ln)} > 100)."))
+            if len(ln) > 88:
+                issues.append((i, "LINE", f"Line too long ({len(ln)} > 88)."))
             if ln.rstrip() != ln:
                 issues.append((i, "WS", "Trailing whitespace."))
-        try:
-            ast.parse(code)
-        except SyntaxError as e:
-            issues.append((getattr(e, "lineno", 0) or 0, "SYNTAX", e.msg))
+        if not flakes_available:
+            try:
+                ast.parse(code)
+            except SyntaxError as e:
+                issues.append((getattr(e, "lineno", 0) or 0, "SYNTAX", e.msg))
+        issues.sort(key=lambda issue: issue[0])
 
         if not issues:
-            console.print(
-                Panel(
-                    "No lint issues found (basic checks).", title="🧹 Lint", border_style="green"
-                )
+            message = (
+                "No lint issues found."
+                if flakes_available
+                else "No lint issues found (basic checks)."
             )
+            console.print(Panel(message, title="🧹 Lint", border_style="green"))
         else:
-            table = Table(title="Lint Issues (basic)")
+            from rich.table import Table
+            from rich.text import Text
+
+            table = Table(title="Lint Issues" if flakes_available else "Lint Issues (basic)")
             table.add_column("Line", style="cyan", justify="right")
             table.add_column("Code", style="magenta")
             table.add_column("Message", style="yellow")
             for line, code_, msg in issues[:50]:
-                table.add_row(str(line), code_, msg)
+                # Plain Text cells skip Rich's markup parser for every row
+                table.add_row(Text(str(line)), Text(code_), Text(msg))
             console.print(table)
 
     def get_hint(self):
@@ -465,13 +734,8 @@ class TutorSession:
             hint = self.current_problem.hints[self.hint_level - 1]
         else:
             # Generate LLM hint
-            with console.status("[dim]Generating hint...[/dim]"):
-                code = self.current_attempt.code if self.current_attempt else ""
-                hint = llm_service.generate_hint(
-                    problem=self.current_problem.description,
-                    current_code=code,
-                    hint_level=self.hint_level,
-                )
+            code = self.current_attempt.code if self.current_attempt else ""
+            hint = self._llm_bundle(code).get("hint", "")
 
         console.print(
             Panel(
@@ -491,11 +755,13 @@ class TutorSession:
         test_cases = self.current_problem.test_cases
 
         console.print("\n[bold]Testing your solution...[/bold]")
+        import asyncio
+        from rich.progress import Progress, SpinnerColumn, TextColumn
 
-        # Execute code with test cases
+        # Execute code with test cases while the LLM review is in flight
         with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
             _task = progress.add_task("Running tests...", total=None)
-            results = code_execution_service.execute_python_code(code, test_cases)
+            results = asyncio.run(self._run_submission(code, test_cases))
 
         # Display results
         self.display_test_results(results)
@@ -504,17 +770,64 @@ class TutorSession:
         if results["syntax_valid"]:
             self.provide_detailed_feedback(code, results)
 
-        # Update attempt record
-        db_service.update_attempt(
-            self.current_attempt.id,
+        # Update attempt record together with any pending code changes
+        self._pending_updates.update(
             status="solved" if results["success"] else "attempted",
             feedback=results,
         )
+        self._flush_attempt()
+        if results["success"]:
+            self._solved_problem_ids().add(self.current_problem.id)
 
         return results["success"]
 
+    async def _run_submission(self, code: str, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run the tests and fetch the LLM review concurrently.
+
+        The review lands in the bundle cache, where ``provide_detailed_feedback``
+        picks it up; it is only requested for code the executor will run.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        key = self._bundle_key(code)
+        review = None
+        if key not in self._bundle_cache:
+            try:
+                _executor().validate_code(code)
+            except SyntaxError:
+                # Includes restricted code, whose review would never be shown
+                pass
+            else:
+                review = asyncio.ensure_future(
+                    _llm().generate_bundle_async(
+                        code=code,
+                        problem=self._problem_prefix,
+                        hint_level=self._bundle_hint_level,
+                    )
+                )
+
+        results = await loop.run_in_executor(
+            None, _executor().execute_python_code, code, test_cases
+        )
+        if review is not None:
+            self._bundle_cache[key] = await review
+        return results
+
     def display_test_results(self, results: Dict[str, Any]):
         """Display test execution results."""
+        if results.get("restricted"):
+            from rich.markup import escape
+
+            console.print(
+                Panel(
+                    f"[red]Not allowed: {escape(results['errors'])}[/red]",
+                    title="❌ Restricted Code",
+                    border_style="red",
+                )
+            )
+            return
+
         if not results["syntax_valid"]:
             console.print(
                 Panel(
@@ -538,6 +851,9 @@ class TutorSession:
 
         # Show individual test results
         if results["test_results"]:
+            from rich.table import Table
+            from rich.text import Text
+
             table = Table(title="Test Case Results")
             table.add_column("Test", style="cyan")
             table.add_column("Input", style="magenta")
@@ -545,29 +861,28 @@ class TutorSession:
             table.add_column("Actual", style="yellow")
             table.add_column("Result", justify="center")
 
+            # Text cells are not parsed as markup, so inputs like "[b]" print verbatim
             for test in results["test_results"]:
-                status = "✅" if test["passed"] else "❌"
                 table.add_row(
-                    str(test["test_case"]),
-                    str(test["input"]),
-                    str(test["expected"]),
-                    str(test.get("actual", "Error")),
-                    status,
+                    Text(str(test["test_case"])),
+                    Text(str(test["input"])),
+                    Text(str(test["expected"])),
+                    Text(str(test.get("actual", "Error"))),
+                    Text("✅" if test["passed"] else "❌"),
                 )
 
             console.print(table)
 
     def provide_detailed_feedback(self, code: str, results: Dict[str, Any]):
         """Provide detailed LLM feedback on the solution."""
-        with console.status("[dim]Generating detailed feedback...[/dim]"):
-            feedback = llm_service.provide_line_by_line_feedback(
-                code=code, problem=self.current_problem.description
-            )
+        feedback = self._llm_bundle(code)
 
         # Always compute heuristic complexity as a fallback
-        heuristics = code_execution_service.analyze_complexity(
-            code_execution_service.sanitize_code(code)
-        )
+        # Reuse the AST from the editor's syntax check when it is still fresh
+        try:
+            heuristics = _executor().analyze_complexity_tree(self._parse(code))
+        except SyntaxError:
+            heuristics = _executor().analyze_complexity(self._sanitize(code))
 
         # Display overall feedback
         overall = feedback.get("overall_feedback", "No feedback available")
@@ -588,12 +903,15 @@ class TutorSession:
             feedback.get("space_complexity"),
             heuristics.get("space_complexity", "Unknown"),
         )
-        complexity_info = f"""
-        **Time Complexity:** {time_c}
-        **Space Complexity:** {space_c}
-        """
+        from rich.text import Text
+
+        complexity_info = Text()
+        complexity_info.append("Time Complexity: ", style="bold")
+        complexity_info.append(f"{time_c}\n")
+        complexity_info.append("Space Complexity: ", style="bold")
+        complexity_info.append(space_c)
         console.print(
-            Panel(Markdown(complexity_info), title="⚡ Complexity Analysis", border_style="cyan")
+            Panel(complexity_info, title="⚡ Complexity Analysis", border_style="cyan")
         )
 
         # If no LLM available, provide a helpful hint to enable it
@@ -627,22 +945,24 @@ def main(user: str, init: bool):
 
     if init:
         console.print("[yellow]Initializing database and sample data...[/yellow]")
-        db_service.create_tables()
+        _db().create_tables()
+        from algotutor.services.curriculum import curriculum_service
+
         curriculum_service.initialize_default_data()
         console.print("[green]✅ Initialization complete![/green]")
         return
 
     # Ensure database is set up
-    db_service.create_tables()
+    _db().create_tables()
 
     # Get or create user
     if not user:
         user = Prompt.ask("Enter your username")
 
-    db_user = db_service.get_user_by_username(user)
+    db_user = _db().get_user_by_username(user)
     if not db_user:
         console.print(f"[green]Creating new user account for {user}[/green]")
-        db_user = db_service.create_user(username=user)
+        db_user = _db().create_user(username=user)
 
     # Start tutoring session
     session = TutorSession(db_user)
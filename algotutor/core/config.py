@@ -1,6 +1,7 @@
 """Configuration management for CB Algorithm Tutor."""
 
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -27,11 +28,17 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
+        # Shared by every module via get_settings(); never mutated at runtime
+        frozen=True,
     )
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings."""
+    """Get application settings, parsed once per process.
+
+    Call ``get_settings.cache_clear()`` to re-read the environment.
+    """
     return Settings()
 
 
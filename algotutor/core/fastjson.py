@@ -0,0 +1,56 @@
+"""JSON helpers that use the fastest available backend.
+
+orjson is preferred, then ujson, then the standard library. Both fast
+backends are optional; anything they reject is retried with ``json`` so
+results and errors match the stdlib on every install.
+"""
+
+import json
+import re
+from typing import Any, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore
+
+ujson = None
+if orjson is None:
+    try:
+        import ujson  # type: ignore
+    except ImportError:  # pragma: no cover - depends on environment
+        pass
+
+JSONDecodeError = json.JSONDecodeError
+
+# The fast decoders mangle or reject integers wider than 64 bits; leave those to the stdlib
+_LONG_NUMBER = re.compile(r"\d{19,}")
+
+
+def dumps(value: Any) -> str:
+    """Serialize ``value`` to a compact JSON string."""
+    try:
+        if orjson is not None:
+            return orjson.dumps(value).decode("utf-8")
+        if ujson is not None:
+            return ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False)
+    except (TypeError, OverflowError):
+        # e.g. integers wider than 64 bits
+        pass
+    return json.dumps(value)
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """Parse a JSON document; invalid input raises ``JSONDecodeError``."""
+    if isinstance(text, bytes):
+        text = text.decode("utf-8")
+    if not _LONG_NUMBER.search(text):
+        try:
+            if orjson is not None:
+                return orjson.loads(text)
+            if ujson is not None:
+                return ujson.loads(text)
+        except ValueError:
+            # Let the stdlib produce its usual error (orjson's is already a subclass)
+            pass
+    return json.loads(text)
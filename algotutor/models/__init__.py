@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel
@@ -21,7 +21,7 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     last_active = Column(DateTime, default=datetime.utcnow)
     current_curriculum_id = Column(Integer)
-    settings = Column(JSON, default={})
+    settings = Column(JSON, default=dict)
 
 
 class Curriculum(Base):
@@ -70,6 +70,9 @@ class Problem(Base):
     test_cases = Column(JSON)
     hints = Column(JSON)  # Progressive hints
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Also serves category-only lookups (leftmost column)
+    __table_args__ = (Index("ix_problem_category_difficulty", "category", "difficulty"),)
 
 
 class Attempt(Base):
@@ -88,6 +91,21 @@ class Attempt(Base):
     patterns_recognized = Column(JSON)  # Identified algorithm patterns
     time_spent_minutes = Column(Integer)
     attempted_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Covers the solved-problems lookup (filter on user/status, distinct problem)
+    __table_args__ = (
+        Index("ix_attempt_user_status_problem", "user_id", "status", "problem_id"),
+    )
+
+
+class LLMCacheEntry(Base):
+    """Cached LLM response keyed by a digest of the request."""
+    
+    __tablename__ = "llm_cache"
+    
+    key = Column(String(64), primary_key=True)
+    response = Column(JSON)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 
 # Pydantic models for API/data validation
@@ -1,50 +1,34 @@
 """Curriculum management service."""
 
+import threading
 from typing import Dict, List, Any, Optional
 from algotutor.services.database import db_service
 from algotutor.models import Curriculum, Problem
 
+# Seed data is built once at import; callers pass it straight to the database
+_DEFAULT_TOPICS = (
+    "Arrays and Strings",
+    "Two Pointers",
+    "Sliding Window",
+    "Hash Tables",
+    "Linked Lists",
+    "Stacks and Queues",
+    "Binary Search",
+    "Sorting Algorithms",
+    "Binary Trees",
+    "Binary Search Trees",
+    "Tree Traversal",
+    "Heaps",
+    "Graphs - BFS/DFS",
+    "Dynamic Programming",
+    "Backtracking",
+    "Greedy Algorithms"
+)
 
-class CurriculumService:
-    """Service for managing learning curricula."""
-    
-    def __init__(self):
-        self.db = db_service
-        
-    def create_default_curriculum(self) -> Curriculum:
-        """Create a default algorithm curriculum."""
-        topics = [
-            "Arrays and Strings",
-            "Two Pointers",
-            "Sliding Window",
-            "Hash Tables",
-            "Linked Lists",
-            "Stacks and Queues",
-            "Binary Search",
-            "Sorting Algorithms",
-            "Binary Trees",
-            "Binary Search Trees",
-            "Tree Traversal",
-            "Heaps",
-            "Graphs - BFS/DFS",
-            "Dynamic Programming",
-            "Backtracking",
-            "Greedy Algorithms"
-        ]
-        
-        return self.db.create_curriculum(
-            name="Complete Algorithm Mastery",
-            description="Comprehensive algorithm curriculum covering all essential patterns",
-            topics=topics,
-            difficulty_level="progressive"
-        )
-    
-    def create_sample_problems(self) -> List[Problem]:
-        """Create sample problems for the curriculum."""
-        sample_problems = [
-            {
-                "title": "Two Sum",
-                "description": """Given an array of integers nums and an integer target, 
+_SAMPLE_PROBLEMS = (
+    {
+        "title": "Two Sum",
+        "description": """Given an array of integers nums and an integer target, 
                 return indices of the two numbers such that they add up to target.
                 
                 You may assume that each input would have exactly one solution, 
@@ -54,26 +38,26 @@ class CurriculumService:
                 Input: nums = [2,7,11,15], target = 9
                 Output: [0,1]
                 Explanation: Because nums[0] + nums[1] == 9, we return [0, 1].""",
-                "difficulty": "easy",
-                "category": "Arrays and Strings",
-                "patterns": ["hash_table", "two_pointer"],
-                "solution_template": """def twoSum(nums, target):
+        "difficulty": "easy",
+        "category": "Arrays and Strings",
+        "patterns": ["hash_table", "two_pointer"],
+        "solution_template": """def twoSum(nums, target):
     # Your solution here
     pass""",
-                "test_cases": [
-                    {"input": [[2, 7, 11, 15], 9], "expected": [0, 1]},
-                    {"input": [[3, 2, 4], 6], "expected": [1, 2]},
-                    {"input": [[3, 3], 6], "expected": [0, 1]}
-                ],
-                "hints": [
-                    "Think about what data structure can help you find complements efficiently",
-                    "Consider using a hash map to store values and their indices",
-                    "For each number, check if target - number exists in your hash map"
-                ]
-            },
-            {
-                "title": "Valid Parentheses",
-                "description": """Given a string s containing just the characters '(', ')', '{', '}', '[' and ']', 
+        "test_cases": [
+            {"input": [[2, 7, 11, 15], 9], "expected": [0, 1]},
+            {"input": [[3, 2, 4], 6], "expected": [1, 2]},
+            {"input": [[3, 3], 6], "expected": [0, 1]}
+        ],
+        "hints": [
+            "Think about what data structure can help you find complements efficiently",
+            "Consider using a hash map to store values and their indices",
+            "For each number, check if target - number exists in your hash map"
+        ]
+    },
+    {
+        "title": "Valid Parentheses",
+        "description": """Given a string s containing just the characters '(', ')', '{', '}', '[' and ']', 
                 determine if the input string is valid.
                 
                 An input string is valid if:
@@ -83,58 +67,74 @@ class CurriculumService:
                 Example:
                 Input: s = "()[]{}"
                 Output: true""",
-                "difficulty": "easy",
-                "category": "Stacks and Queues",
-                "patterns": ["stack"],
-                "solution_template": """def isValid(s):
+        "difficulty": "easy",
+        "category": "Stacks and Queues",
+        "patterns": ["stack"],
+        "solution_template": """def isValid(s):
     # Your solution here
     pass""",
-                "test_cases": [
-                    {"input": ["()"], "expected": True},
-                    {"input": ["()[]{})"], "expected": True},
-                    {"input": ["(]"], "expected": False},
-                    {"input": ["([)]"], "expected": False}
-                ],
-                "hints": [
-                    "Think about Last In, First Out (LIFO) data structure",
-                    "Use a stack to keep track of opening brackets",
-                    "When you see a closing bracket, check if it matches the most recent opening bracket"
-                ]
-            },
-            {
-                "title": "Maximum Subarray",
-                "description": """Given an integer array nums, find the contiguous subarray 
+        "test_cases": [
+            {"input": ["()"], "expected": True},
+            {"input": ["()[]{})"], "expected": True},
+            {"input": ["(]"], "expected": False},
+            {"input": ["([)]"], "expected": False}
+        ],
+        "hints": [
+            "Think about Last In, First Out (LIFO) data structure",
+            "Use a stack to keep track of opening brackets",
+            "When you see a closing bracket, check if it matches the most recent opening bracket"
+        ]
+    },
+    {
+        "title": "Maximum Subarray",
+        "description": """Given an integer array nums, find the contiguous subarray 
                 (containing at least one number) which has the largest sum and return its sum.
                 
                 Example:
                 Input: nums = [-2,1,-3,4,-1,2,1,-5,4]
                 Output: 6
                 Explanation: [4,-1,2,1] has the largest sum = 6.""",
-                "difficulty": "medium",
-                "category": "Dynamic Programming",
-                "patterns": ["dynamic_programming", "kadanes_algorithm"],
-                "solution_template": """def maxSubArray(nums):
+        "difficulty": "medium",
+        "category": "Dynamic Programming",
+        "patterns": ["dynamic_programming", "kadanes_algorithm"],
+        "solution_template": """def maxSubArray(nums):
     # Your solution here
     pass""",
-                "test_cases": [
-                    {"input": [[-2,1,-3,4,-1,2,1,-5,4]], "expected": 6},
-                    {"input": [[1]], "expected": 1},
-                    {"input": [[5,4,-1,7,8]], "expected": 23}
-                ],
-                "hints": [
-                    "Consider Kadane's algorithm for this classic problem",
-                    "At each position, decide whether to extend the current subarray or start a new one",
-                    "Keep track of the maximum sum seen so far"
-                ]
-            }
+        "test_cases": [
+            {"input": [[-2,1,-3,4,-1,2,1,-5,4]], "expected": 6},
+            {"input": [[1]], "expected": 1},
+            {"input": [[5,4,-1,7,8]], "expected": 23}
+        ],
+        "hints": [
+            "Consider Kadane's algorithm for this classic problem",
+            "At each position, decide whether to extend the current subarray or start a new one",
+            "Keep track of the maximum sum seen so far"
         ]
+    }
+)
+
+
+class CurriculumService:
+    """Service for managing learning curricula."""
+    
+    def __init__(self):
+        self.db = db_service
+        # Set once the database is known to hold the default data
+        self._initialized = False
+        self._init_lock = threading.Lock()
         
-        problems = []
-        for problem_data in sample_problems:
-            problem = self.db.create_problem(**problem_data)
-            problems.append(problem)
-            
-        return problems
+    def create_default_curriculum(self) -> Curriculum:
+        """Create a default algorithm curriculum."""
+        return self.db.create_curriculum(
+            name="Complete Algorithm Mastery",
+            description="Comprehensive algorithm curriculum covering all essential patterns",
+            topics=list(_DEFAULT_TOPICS),
+            difficulty_level="progressive"
+        )
+    
+    def create_sample_problems(self) -> List[Problem]:
+        """Create sample problems for the curriculum."""
+        return self.db.create_problems_bulk(_SAMPLE_PROBLEMS)
     
     def get_next_topic(self, user_id: int, curriculum_id: int) -> Optional[str]:
         """Get the next topic for a user based on their progress."""
@@ -148,27 +148,25 @@ class CurriculumService:
     
     def get_problems_for_topic(self, topic: str, difficulty: str = None) -> List[Problem]:
         """Get problems for a specific topic."""
-        problems = self.db.get_problems_by_category(topic)
-        
-        if difficulty:
-            problems = [p for p in problems if p.difficulty == difficulty]
-            
-        return problems
+        return self.db.get_problems_by_category(topic, difficulty=difficulty)
     
     def initialize_default_data(self):
         """Initialize the database with default curriculum and problems."""
-        # Check if we already have data
-        curricula = self.db.list_curricula()
-        if curricula:
-            return  # Already initialized
-            
-        # Create default curriculum
-        curriculum = self.create_default_curriculum()
-        
-        # Create sample problems
-        problems = self.create_sample_problems()
-        
-        print(f"Initialized curriculum '{curriculum.name}' with {len(problems)} sample problems")
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            # Check if we already have data
+            if not self.db.has_curricula():
+                # Create default curriculum
+                curriculum = self.create_default_curriculum()
+
+                # Create sample problems
+                problems = self.create_sample_problems()
+
+                print(f"Initialized curriculum '{curriculum.name}' with {len(problems)} sample problems")
+            self._initialized = True
 
 
 # Global curriculum service instance
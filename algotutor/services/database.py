@@ -1,22 +1,55 @@
 """Database service for CB Algorithm Tutor."""
 
-from typing import Optional, List
-from sqlalchemy import create_engine
+from typing import Optional, Iterable, List, Dict, Any
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import sessionmaker, Session
+from algotutor.core import fastjson
 from algotutor.core.config import settings
 from algotutor.models import Base, User, Curriculum, Session as LearningSession, Problem, Attempt
 
 
+def _configure_sqlite(dbapi_connection, _record):
+    """Use WAL journaling so reads don't block on writes and commits skip most fsyncs."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+    finally:
+        cursor.close()
+
+
 class DatabaseService:
     """Service for database operations."""
     
     def __init__(self):
-        self.engine = create_engine(settings.database_url)
+        if settings.database_url.startswith("sqlite"):
+            self.engine = create_engine(
+                settings.database_url,
+                connect_args={"check_same_thread": False},
+                json_serializer=fastjson.dumps,
+                json_deserializer=fastjson.loads,
+            )
+            event.listen(self.engine, "connect", _configure_sqlite)
+        else:
+            self.engine = create_engine(
+                settings.database_url,
+                pool_pre_ping=True,
+                json_serializer=fastjson.dumps,
+                json_deserializer=fastjson.loads,
+            )
         self.SessionLocal = sessionmaker(bind=self.engine)
         
     def create_tables(self):
-        """Create database tables."""
+        """Create database tables, and any indexes missing from existing ones."""
         Base.metadata.create_all(bind=self.engine)
+        # create_all skips tables that already exist, so databases created
+        # before an index was added only pick it up here
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
         
     def get_session(self) -> Session:
         """Get database session."""
@@ -67,6 +100,12 @@ class DatabaseService:
         """List all active curricula."""
         with self.get_session() as session:
             return session.query(Curriculum).filter(Curriculum.is_active == True).all()
+
+    def has_curricula(self) -> bool:
+        """Whether any active curriculum exists, without loading one."""
+        with self.get_session() as session:
+            query = session.query(Curriculum.id).filter(Curriculum.is_active == True)
+            return session.query(query.exists()).scalar()
     
     # Problem operations
     def create_problem(self, title: str, description: str, difficulty: str,
@@ -89,15 +128,33 @@ class DatabaseService:
             session.refresh(problem)
             return problem
             
+    def create_problems_bulk(self, problems: Iterable[Dict[str, Any]]) -> List[Problem]:
+        """Create several problems in one transaction.
+
+        Each mapping takes the same keyword arguments as ``create_problem``.
+        """
+        with self.get_session() as session, session.begin():
+            created = [Problem(**data) for data in problems]
+            session.add_all(created)
+            # Flush to assign ids, then detach so the commit does not expire them
+            session.flush()
+            session.expunge_all()
+            return created
+
     def get_problem(self, problem_id: int) -> Optional[Problem]:
         """Get problem by ID."""
         with self.get_session() as session:
             return session.query(Problem).filter(Problem.id == problem_id).first()
             
-    def get_problems_by_category(self, category: str) -> List[Problem]:
-        """Get problems by category."""
+    def get_problems_by_category(
+        self, category: str, difficulty: Optional[str] = None
+    ) -> List[Problem]:
+        """Get problems by category, optionally limited to one difficulty."""
         with self.get_session() as session:
-            return session.query(Problem).filter(Problem.category == category).all()
+            query = session.query(Problem).filter(Problem.category == category)
+            if difficulty:
+                query = query.filter(Problem.difficulty == difficulty)
+            return query.all()
 
     def list_problem_categories(self) -> List[str]:
         """List distinct categories that have problems."""
@@ -110,6 +167,16 @@ class DatabaseService:
         with self.get_session() as session:
             return session.query(Problem).order_by(Problem.category, Problem.title).all()
 
+    def list_problem_summaries(self, category: Optional[str] = None) -> List[Row]:
+        """List (id, title, category, difficulty, patterns) rows, optionally for one category."""
+        with self.get_session() as session:
+            query = session.query(
+                Problem.id, Problem.title, Problem.category, Problem.difficulty, Problem.patterns
+            )
+            if category is not None:
+                query = query.filter(Problem.category == category)
+            return query.order_by(Problem.category, Problem.title).all()
+
     def get_solved_problem_ids(self, user_id: int) -> List[int]:
         """Get IDs of all problems solved by a user."""
         with self.get_session() as session:
@@ -138,14 +205,16 @@ class DatabaseService:
             return attempt
             
     def update_attempt(self, attempt_id: int, **kwargs) -> Optional[Attempt]:
-        """Update an attempt."""
-        with self.get_session() as session:
-            attempt = session.query(Attempt).filter(Attempt.id == attempt_id).first()
+        """Update an attempt in a single transaction."""
+        with self.get_session() as session, session.begin():
+            attempt = session.get(Attempt, attempt_id)
             if attempt:
                 for key, value in kwargs.items():
                     setattr(attempt, key, value)
-                session.commit()
-                session.refresh(attempt)
+                # Write now and detach so the commit does not expire the
+                # returned object, which would otherwise need a refresh query
+                session.flush()
+                session.expunge(attempt)
             return attempt
 
 
@@ -1,20 +1,318 @@
 """Code execution service for CB Algorithm Tutor."""
 
 import ast
+from collections import deque
 import re
 import sys
 import subprocess
-import tempfile
-import os
-from typing import Dict, Any, Tuple, List
-from contextlib import contextmanager
-import io
+from typing import Callable, Dict, Any, List, Optional, Set
+from functools import lru_cache
+from types import CodeType
+
+
+# Submissions are re-run and re-analyzed unchanged (submit, then feedback),
+# so sanitizing and parsing are memoized on the source text. Cached trees
+# are shared: callers must not mutate them.
+@lru_cache(maxsize=256)
+def _sanitize_cached(code: str) -> str:
+    # Most submissions have neither; skip the copying passes entirely
+    if "\r" in code:
+        code = code.replace("\r\n", "\n").replace("\r", "\n")
+    if "\t" in code:
+        # Use Python-compatible tab expansion to avoid reducing indent depth
+        code = code.expandtabs(8)
+    return code
+
+
+@lru_cache(maxsize=256)
+def _parse_cached(source: str) -> ast.Module:
+    return ast.parse(source)
+
+
+class RestrictedCodeError(SyntaxError):
+    """Valid Python that uses a construct the restricted namespace forbids."""
+
+
+def _reject(node: ast.AST, message: str) -> None:
+    raise RestrictedCodeError(f"{message} (line {getattr(node, 'lineno', '?')})")
+
+
+def _check_restricted(tree: ast.AST) -> None:
+    """Reject constructs the restricted namespace cannot safely run.
+
+    Imports would fail at run time anyway (there is no ``__import__``);
+    dunder attributes such as ``__class__`` are the usual way out of a
+    builtins whitelist.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            _reject(node, "import statements are not allowed")
+        elif (
+            isinstance(node, ast.Attribute)
+            and node.attr.startswith("__")
+            and node.attr.endswith("__")
+        ):
+            _reject(node, f"access to attribute '{node.attr}' is not allowed")
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(source: str) -> CodeType:
+    # Compile from the cached tree so the source is not lexed a second time
+    tree = _parse_cached(source)
+    _check_restricted(tree)
+    return compile(tree, "<user>", "exec")
+
+
+@lru_cache(maxsize=256)
+def _main_function_name(source: str) -> Optional[str]:
+    """Name of the first public top-level function in ``source``, in source order."""
+    for node in _parse_cached(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith("_"):
+            return node.name
+    return None
+
+
+# A submission's entry point, as found by _load_main_function
+MainFunction = Callable[..., Any]
+
+
+# Builtins available to submitted code; built once and shared by every run
+_SAFE_BUILTINS = {
+    "len": len, "range": range, "enumerate": enumerate,
+    "zip": zip, "map": map, "filter": filter, "sorted": sorted,
+    "min": min, "max": max, "sum": sum, "abs": abs,
+    "print": print, "str": str, "int": int, "float": float,
+    "list": list, "dict": dict, "set": set, "tuple": tuple,
+    # Needed by class statements, for class-based solutions
+    "__build_class__": __build_class__,
+}
+
+
+@lru_cache(maxsize=256)
+def _complexity_verdict(tree: ast.AST) -> Dict[str, str]:
+    # Keyed by tree identity: trees come from _parse_cached, so resubmitting
+    # the same source reuses the verdict. Callers receive copies.
+    time_complexity = "O(1)"
+    space_complexity = "O(1)"
+
+    try:
+        facts = _scan_complexity(tree)
+
+        if facts["max_loop_depth"] >= 2:
+            time_complexity = "O(n²)"
+        elif facts["max_loop_depth"] == 1:
+            time_complexity = "O(n)"
+        elif facts["has_sorting"]:
+            time_complexity = "O(n log n)"
+        elif facts["has_recursion"]:
+            time_complexity = "O(n)"
+
+        if facts["creates_new_data_structures"] or facts["has_recursion"]:
+            space_complexity = "O(n)"
+
+    except Exception:
+        pass
+
+    return {"time_complexity": time_complexity, "space_complexity": space_complexity}
+
+
+# Node classes the complexity scan reacts to, keyed by exact type: one dict
+# lookup per node instead of a chain of isinstance checks
+_LOOP, _CALL, _FUNCTION, _CONTAINER = range(4)
+_NODE_KINDS = {
+    ast.For: _LOOP,
+    ast.While: _LOOP,
+    ast.Call: _CALL,
+    ast.FunctionDef: _FUNCTION,
+    **dict.fromkeys(
+        (ast.List, ast.Dict, ast.Set, ast.ListComp, ast.DictComp, ast.SetComp), _CONTAINER
+    ),
+}
+
+
+def _scan_complexity(tree: ast.AST) -> Dict[str, Any]:
+    """Collect the structural facts used by the complexity heuristic in one pass.
+
+    The walk is iterative, so deeply nested input cannot hit the recursion
+    limit. Recursion is detected as soon as a defined function name is also
+    called. The walk stops once every flag is set and loops nest at least
+    twice, since nothing further can change the verdict; ``max_loop_depth``
+    is therefore exact only up to 2.
+    """
+    max_loop_depth = 0
+    has_sorting = False
+    has_recursion = False
+    creates_new_data_structures = False
+    func_names: Set[str] = set()
+    called_names: Set[str] = set()
+
+    stack = deque([(tree, 0)])
+    while stack:
+        node, depth = stack.pop()
+        kind = _NODE_KINDS.get(type(node))
+        if kind == _LOOP:
+            depth += 1
+            if depth > max_loop_depth:
+                max_loop_depth = depth
+        elif kind == _CALL:
+            func = node.func
+            if isinstance(func, ast.Attribute) and func.attr in {"sort", "sorted"}:
+                has_sorting = True
+            elif isinstance(func, ast.Name):
+                if func.id == "sorted":
+                    has_sorting = True
+                called_names.add(func.id)
+                has_recursion = has_recursion or func.id in func_names
+        elif kind == _FUNCTION:
+            func_names.add(node.name)
+            has_recursion = has_recursion or node.name in called_names
+        elif kind == _CONTAINER:
+            creates_new_data_structures = True
+        if (
+            max_loop_depth >= 2
+            and has_sorting
+            and has_recursion
+            and creates_new_data_structures
+        ):
+            break
+        stack.extend((child, depth) for child in ast.iter_child_nodes(node))
+
+    return {
+        "max_loop_depth": max_loop_depth,
+        "has_sorting": has_sorting,
+        "has_recursion": has_recursion,
+        "creates_new_data_structures": creates_new_data_structures,
+    }
+
+
+def _names(node: ast.AST) -> Set[str]:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _is_halving(node: ast.AST) -> bool:
+    """Match ``x // 2`` and ``x >> 1``, the midpoint step of a binary search."""
+    return isinstance(node, ast.BinOp) and (
+        (isinstance(node.op, ast.FloorDiv) and getattr(node.right, "value", None) == 2)
+        or (isinstance(node.op, ast.RShift) and getattr(node.right, "value", None) == 1)
+    )
+
+
+def _pointer_steps(loop: ast.AST) -> Dict[str, Set[type]]:
+    """Map each name to the ``+=``/``-=`` operators applied to it inside ``loop``."""
+    steps: Dict[str, Set[type]] = {}
+    for node in ast.walk(loop):
+        if (
+            isinstance(node, ast.AugAssign)
+            and isinstance(node.target, ast.Name)
+            and isinstance(node.op, (ast.Add, ast.Sub))
+        ):
+            steps.setdefault(node.target.id, set()).add(type(node.op))
+    return steps
+
+
+class PatternDetector(ast.NodeVisitor):
+    """Recognize common algorithm patterns from the shape of the AST.
+
+    Names match the vocabulary ``LLMService.analyze_code_patterns`` asks
+    the model for, so the two are interchangeable.
+    """
+
+    _MEMO_DECORATORS = {"lru_cache", "cache"}
+
+    def detect(self, code: str) -> List[str]:
+        """Return the patterns found in ``code``; empty if it does not parse."""
+        try:
+            tree = _parse_cached(_sanitize_cached(code))
+        except SyntaxError:
+            return []
+        self.found: Set[str] = set()
+        self._functions: List[str] = []
+        self._params: List[Set[str]] = []
+        self._subscript_stores: Set[str] = set()
+        self._argument_keyed: Set[str] = set()
+        self._membership_checks: Set[str] = set()
+        self.visit(tree)
+        # A dict that is checked and then filled is only a memo when it
+        # caches calls: a lookup table keyed by loop values (the hash-map
+        # Two Sum) is not, so require recursion or argument-derived keys
+        caches = self._subscript_stores & self._membership_checks
+        if caches and ("recursion" in self.found or caches & self._argument_keyed):
+            self.found.add("memoization")
+        order = ("two_pointer", "sliding_window", "binary_search", "memoization", "recursion")
+        return [name for name in order if name in self.found]
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        for decorator in node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            name = getattr(target, "id", None) or getattr(target, "attr", None)
+            if name in self._MEMO_DECORATORS:
+                self.found.add("memoization")
+        args = node.args
+        params = [*getattr(args, "posonlyargs", []), *args.args, *args.kwonlyargs]
+        params += [a for a in (args.vararg, args.kwarg) if a is not None]
+        self._functions.append(node.name)
+        self._params.append({a.arg for a in params})
+        self.generic_visit(node)
+        self._params.pop()
+        self._functions.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name) and node.func.id in self._functions:
+            self.found.add("recursion")
+        self.generic_visit(node)
+
+    def visit_While(self, node: ast.While) -> None:
+        test = node.test
+        if (
+            isinstance(test, ast.Compare)
+            and len(test.comparators) == 1
+            and isinstance(test.ops[0], (ast.Lt, ast.LtE))
+        ):
+            bounds = _names(test.left) | _names(test.comparators[0])
+            if any(_is_halving(n) for n in ast.walk(node)):
+                self.found.add("binary_search")
+            else:
+                steps = _pointer_steps(node)
+                moved = [steps[name] for name in bounds if name in steps]
+                if len(moved) == 2 and set.union(*moved) == {ast.Add, ast.Sub}:
+                    self.found.add("two_pointer")
+        self.generic_visit(node)
+
+    def visit_For(self, node: ast.For) -> None:
+        right = _names(node.target)
+        for inner in ast.walk(node):
+            if isinstance(inner, ast.While):
+                shrinking = {
+                    name for name, ops in _pointer_steps(inner).items() if ast.Add in ops
+                }
+                if shrinking - right:
+                    self.found.add("sliding_window")
+        self.generic_visit(node)
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, ast.In) and isinstance(comparator, ast.Name):
+                self._membership_checks.add(comparator.id)
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        if isinstance(node.ctx, ast.Store) and isinstance(node.value, ast.Name):
+            self._subscript_stores.add(node.value.id)
+            key = node.slice
+            if isinstance(key, getattr(ast, "Index", ())):  # Python 3.8
+                key = key.value
+            key_names = {n.id for n in ast.walk(key) if isinstance(n, ast.Name)}
+            if key_names and self._params and key_names <= self._params[-1]:
+                self._argument_keyed.add(node.value.id)
+        self.generic_visit(node)
 
 
 class CodeExecutionService:
     """Service for safe code execution and testing."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.timeout_seconds = 10
         
     def execute_python_code(self, code: str, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -27,13 +325,22 @@ class CodeExecutionService:
             "errors": "",
             "test_results": [],
             "execution_time": 0,
-            "syntax_valid": False
+            "syntax_valid": False,
+            "restricted": False
         }
         
-        # First, check syntax
+        # First, check syntax and reject disallowed constructs
         try:
-            ast.parse(code)
+            _compile_cached(code)
             results["syntax_valid"] = True
+        except RestrictedCodeError as e:
+            # Parses fine but cannot run here; say why instead of "Syntax Error"
+            results["restricted"] = True
+            results["errors"] = (
+                f"{e}\nHint: Solutions run without imports. Built-ins such as len, "
+                "range, sorted, min, max, list, dict and set are already available."
+            )
+            return results
         except SyntaxError as e:
             msg = str(e)
             if "inconsistent use of tabs and spaces" in msg:
@@ -43,67 +350,13 @@ class CodeExecutionService:
         
         # Execute code with test cases
         try:
-            # Create a safe execution environment
-            exec_globals = {
-                "__builtins__": {
-                    "len": len, "range": range, "enumerate": enumerate,
-                    "zip": zip, "map": map, "filter": filter, "sorted": sorted,
-                    "min": min, "max": max, "sum": sum, "abs": abs,
-                    "print": print, "str": str, "int": int, "float": float,
-                    "list": list, "dict": dict, "set": set, "tuple": tuple,
-                }
-            }
-            
-            # Execute the code
-            exec_locals = {}
-            exec(code, exec_globals, exec_locals)
-            
-            # Find the main function (assume first function defined)
-            main_function = None
-            for name, obj in exec_locals.items():
-                if callable(obj) and not name.startswith('_'):
-                    main_function = obj
-                    break
-            
+            main_function = self._load_main_function(code)
             if main_function is None:
                 results["errors"] = "No callable function found in code"
                 return results
-            
-            # Run test cases
-            passed_tests = 0
-            for i, test_case in enumerate(test_cases):
-                try:
-                    input_args = test_case.get("input", [])
-                    expected_output = test_case.get("expected", None)
-                    
-                    # Handle different input formats
-                    if isinstance(input_args, list):
-                        actual_output = main_function(*input_args)
-                    else:
-                        actual_output = main_function(input_args)
-                    
-                    test_passed = actual_output == expected_output
-                    if test_passed:
-                        passed_tests += 1
-                    
-                    results["test_results"].append({
-                        "test_case": i + 1,
-                        "input": input_args,
-                        "expected": expected_output,
-                        "actual": actual_output,
-                        "passed": test_passed
-                    })
-                    
-                except Exception as e:
-                    results["test_results"].append({
-                        "test_case": i + 1,
-                        "input": input_args,
-                        "expected": expected_output,
-                        "actual": None,
-                        "passed": False,
-                        "error": str(e)
-                    })
-            
+            results["test_results"] = self._run_test_cases(main_function, test_cases)
+
+            passed_tests = sum(1 for r in results["test_results"] if r["passed"])
             results["success"] = passed_tests == len(test_cases)
             results["output"] = f"Passed {passed_tests}/{len(test_cases)} test cases"
             
@@ -112,6 +365,73 @@ class CodeExecutionService:
         
         return results
 
+    def _load_main_function(self, code: str) -> Optional[MainFunction]:
+        """Execute ``code`` in a restricted namespace and return its first function."""
+        # One fresh namespace per run, as for a module: functions see
+        # top-level names and ``global`` statements write back to it
+        namespace = {"__builtins__": _SAFE_BUILTINS, "__name__": "<user>"}
+        
+        # Execute the code (compiled once per distinct source)
+        exec(_compile_cached(code), namespace)
+        
+        # Find the main function (assume first function defined)
+        main_function = namespace.get(_main_function_name(code))
+        if callable(main_function):
+            return main_function
+        # No plain function (e.g. a class or a lambda): first public callable
+        for name, obj in namespace.items():
+            if callable(obj) and not name.startswith('_'):
+                return obj
+        return None
+
+    def validate_code(self, code: str) -> None:
+        """Check ``code`` the way ``execute_python_code`` does, without running it.
+
+        Raises SyntaxError, or RestrictedCodeError for forbidden constructs.
+        """
+        _compile_cached(self.sanitize_code(code))
+
+    def _run_test_cases(
+        self, main_function: MainFunction, test_cases: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run the test cases and return their results in order."""
+        # One at a time, in order: threads gain nothing for CPU-bound code
+        # under the GIL, and solutions that keep state (e.g. a mutable
+        # default argument) must see the cases in a fixed sequence
+        return [
+            self._run_test_case(main_function, i, test_case)
+            for i, test_case in enumerate(test_cases)
+        ]
+
+    def _run_test_case(self, main_function: MainFunction, index: int, test_case: Dict[str, Any]) -> Dict[str, Any]:
+        """Call ``main_function`` with one test case's input and compare the result."""
+        input_args = test_case.get("input", [])
+        expected_output = test_case.get("expected", None)
+        try:
+            # Handle different input formats
+            if isinstance(input_args, list):
+                actual_output = main_function(*input_args)
+            else:
+                actual_output = main_function(input_args)
+            
+            return {
+                "test_case": index + 1,
+                "input": input_args,
+                "expected": expected_output,
+                "actual": actual_output,
+                "passed": actual_output == expected_output
+            }
+            
+        except Exception as e:
+            return {
+                "test_case": index + 1,
+                "input": input_args,
+                "expected": expected_output,
+                "actual": None,
+                "passed": False,
+                "error": str(e)
+            }
+
     def sanitize_code(self, code: str) -> str:
         """Normalize user code prior to parsing/execution.
 
@@ -121,79 +441,35 @@ class CodeExecutionService:
           multiple of 8 columns). This preserves intended block depth
           when users indent with tabs inside already-indented blocks.
         """
-        normalized = code.replace("\r\n", "\n").replace("\r", "\n")
-        # Use Python-compatible tab expansion to avoid reducing indent depth
-        return normalized.expandtabs(8)
+        return _sanitize_cached(code)
     
-    def analyze_complexity(self, code: str) -> Dict[str, str]:
-        """Analyze time and space complexity of code (basic analysis)."""
-        time_complexity = "O(1)"
-        space_complexity = "O(1)"
+    def analyze_complexity(self, code: str, tree: Optional[ast.AST] = None) -> Dict[str, str]:
+        """Analyze time and space complexity of code (basic analysis).
+
+        Pass ``tree`` when the sanitized code has already been parsed to
+        skip re-tokenizing the source.
+        """
+        if tree is None:
+            try:
+                tree = _parse_cached(self.sanitize_code(code))
+            except Exception:
+                return {"time_complexity": "O(1)", "space_complexity": "O(1)"}
+        return self.analyze_complexity_tree(tree)
+
+    def analyze_complexity_tree(self, tree: ast.AST) -> Dict[str, str]:
+        """Analyze time and space complexity of an already parsed module."""
+        return dict(_complexity_verdict(tree))
 
-        try:
-            src = self.sanitize_code(code)
-            tree = ast.parse(src)
-
-            func_names = {n.name for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)}
-
-            max_loop_depth = 0
-            has_sorting = False
-            has_recursion = False
-            creates_new_data_structures = False
-
-            def visit(node, depth):
-                nonlocal max_loop_depth, has_sorting, has_recursion, creates_new_data_structures
-                if isinstance(node, (ast.For, ast.While)):
-                    depth += 1
-                    max_loop_depth = max(max_loop_depth, depth)
-
-                if isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Attribute) and node.func.attr in {"sort", "sorted"}:
-                        has_sorting = True
-                    if isinstance(node.func, ast.Name) and node.func.id in {"sorted"}:
-                        has_sorting = True
-                    if isinstance(node.func, ast.Name) and node.func.id in func_names:
-                        has_recursion = True
-
-                if isinstance(node, (ast.List, ast.Dict, ast.Set, ast.ListComp, ast.DictComp, ast.SetComp)):
-                    creates_new_data_structures = True
-
-                for child in ast.iter_child_nodes(node):
-                    visit(child, depth)
-
-            visit(tree, 0)
-
-            if max_loop_depth >= 2:
-                time_complexity = "O(n²)"
-            elif max_loop_depth == 1:
-                time_complexity = "O(n)"
-            elif has_sorting:
-                time_complexity = "O(n log n)"
-            elif has_recursion:
-                time_complexity = "O(n)"
-
-            if creates_new_data_structures or has_recursion:
-                space_complexity = "O(n)"
-
-        except Exception:
-            pass
-
-        return {"time_complexity": time_complexity, "space_complexity": space_complexity}
-    
     def run_with_timeout(self, code: str, timeout: int = None) -> Dict[str, Any]:
-        """Run code with timeout protection."""
+        """Run code with timeout protection, in a fresh interpreter per run."""
         if timeout is None:
             timeout = self.timeout_seconds
-            
+
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
-            
-            # Execute with timeout
+            # Feed the script on stdin rather than through a temp file
             result = subprocess.run(
-                [sys.executable, temp_file],
+                [sys.executable, "-"],
+                input=code,
                 capture_output=True,
                 text=True,
                 timeout=timeout
@@ -220,13 +496,6 @@ class CodeExecutionService:
                 "errors": str(e),
                 "timeout": False
             }
-        finally:
-            # Clean up temporary file
-            if 'temp_file' in locals():
-                try:
-                    os.unlink(temp_file)
-                except OSError:
-                    pass
 
 
 # Global code execution service instance
@@ -1,30 +1,138 @@
 """LLM service for CB Algorithm Tutor."""
 
-import json
-from typing import Dict, List, Optional, Any
+import asyncio
+import functools
+import logging
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Any
+from algotutor.core import fastjson
 from algotutor.core.config import settings
+from algotutor.services.execution import PatternDetector
+from algotutor.services.llm_cache import cached_call, llm_cache
 
-# Make OpenAI optional so the app can start without the package
-try:
-    from openai import OpenAI  # type: ignore
-except Exception:  # ImportError or other environment issues
-    OpenAI = None  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _openai() -> Any:
+    """Import the OpenAI SDK on first use; None when it is unavailable.
+
+    The SDK is heavy to import, and offline sessions never need it.
+    """
+    try:
+        import openai
+    except Exception:  # ImportError or other environment issues
+        return None
+    return openai
+
+
+_LLM_ERROR_FEEDBACK = "Unable to analyze code at this time (LLM error)."
+
+_BUNDLE_FALLBACK = {
+    "socratic_question": "What invariant or data structure could simplify your approach?",
+    "hint": "Consider the core pattern likely involved (e.g., hash map, two pointers).",
+    "overall_feedback": _LLM_ERROR_FEEDBACK,
+    "time_complexity": "Unknown",
+    "space_complexity": "Unknown",
+    "patterns_used": [],
+}
+
+
+# JSON mode: the model must return a single parseable object
+_JSON_OBJECT = {"type": "json_object"}
+
+
+class _Fallback(dict):
+    """Placeholder returned when an LLM call fails or its reply cannot be parsed."""
+
+
+_BUNDLE_KEYS = (
+    "socratic_question",
+    "hint",
+    "overall_feedback",
+    "time_complexity",
+    "space_complexity",
+)
+
+
+def _is_answer(result: Any) -> bool:
+    """True for a JSON object from the model with at least ``overall_feedback``."""
+    return (
+        isinstance(result, dict)
+        and not isinstance(result, _Fallback)
+        and "overall_feedback" in result
+    )
+
+
+def _is_bundle(result: Any) -> bool:
+    """True for a complete bundle; fallbacks and partial objects are not cached."""
+    return _is_answer(result) and all(key in result for key in _BUNDLE_KEYS)
+
+
+def build_static_context(problem: Any) -> str:
+    """Render the per-problem context sent ahead of the student's code.
+
+    The text depends only on the problem, so it stays byte-identical across
+    requests and the provider's automatic prompt-prefix cache can reuse it.
+    """
+    patterns = ", ".join(problem.patterns or [])
+    return (
+        f"Problem: {problem.title}\n\n"
+        f"{problem.description}\n\n"
+        f"Relevant patterns: {patterns}\n\n"
+        f"Starter code:\n```python\n{problem.solution_template or ''}\n```"
+    )
+
+
+def _messages(system_prompt: str, problem: str, request: str) -> List[Dict[str, str]]:
+    """Order messages static-first: instructions, problem context, then the request."""
+    context = problem if problem.startswith("Problem:") else f"Problem: {problem}"
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": context},
+        {"role": "user", "content": request},
+    ]
+
+
+def _log_usage(response: Any) -> None:
+    """Log prompt tokens served from the provider's prefix cache."""
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    if usage is not None:
+        logger.debug(
+            "LLM prompt tokens: %s (cached: %s)",
+            getattr(usage, "prompt_tokens", None),
+            getattr(details, "cached_tokens", 0),
+        )
 
 
 class LLMService:
     """Service for LLM interactions using OpenAI."""
     
     def __init__(self):
-        # Lazily initialize client; tolerate missing SDK in non-LLM paths
-        self.client = None
         self.model = settings.model_name
-        if OpenAI is not None and settings.openai_api_key:
-            try:
-                self.client = OpenAI(api_key=settings.openai_api_key)
-            except Exception:
-                # If initialization fails (e.g., bad key), keep client as None
-                self.client = None
-        
+        self._client: Any = None
+        self._client_ready = False
+
+    @property
+    def client(self) -> Any:
+        """The OpenAI client, created on first access; None when offline."""
+        if not self._client_ready:
+            self._client_ready = True
+            sdk = _openai() if settings.openai_api_key else None
+            if sdk is not None:
+                try:
+                    self._client = sdk.OpenAI(api_key=settings.openai_api_key)
+                except Exception:
+                    # If initialization fails (e.g., bad key), keep client as None
+                    self._client = None
+        return self._client
+
+    @client.setter
+    def client(self, value: Any) -> None:
+        self._client, self._client_ready = value, True
+
+    @cached_call("socratic", ttl=timedelta(hours=1))
     def generate_socratic_question(self, code: str, problem: str, context: str) -> str:
         """Generate a Socratic question to guide learning."""
         if self.client is None:
@@ -42,7 +150,6 @@ class LLMService:
         Keep questions focused, specific, and encouraging."""
         
         user_prompt = f"""
-        Problem: {problem}
         Student's current code:
         ```python
         {code}
@@ -52,22 +159,33 @@ class LLMService:
         Generate a Socratic question to help guide this student's learning.
         """
         
+        return self._complete(
+            _messages(system_prompt, problem, user_prompt),
+            max_tokens=settings.max_tokens,
+            temperature=settings.temperature,
+        )
+
+    def _complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> str:
+        """Run a chat completion and return its text."""
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=settings.max_tokens,
-            temperature=settings.temperature
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
         )
-        
+        _log_usage(response)
         return response.choices[0].message.content.strip()
     
+    @cached_call("patterns", ttl=timedelta(days=7), temperature=0.2, should_cache=bool)
     def analyze_code_patterns(self, code: str) -> List[str]:
-        """Analyze code to identify algorithm patterns."""
-        if self.client is None:
-            return []
+        """Analyze code to identify algorithm patterns.
+
+        The local AST detector answers first; the model is only asked when
+        it finds nothing.
+        """
+        patterns = PatternDetector().detect(code)
+        if patterns or self.client is None:
+            return patterns
         system_prompt = """You are an expert algorithm pattern analyzer. 
         Identify the algorithmic patterns, data structures, and techniques used in the given code.
         
@@ -104,11 +222,17 @@ class LLMService:
             )
             
             patterns_json = response.choices[0].message.content.strip()
-            patterns = json.loads(patterns_json)
+            patterns = fastjson.loads(patterns_json)
             return patterns if isinstance(patterns, list) else []
-        except (json.JSONDecodeError, Exception):
+        except (fastjson.JSONDecodeError, Exception):
             return []
     
+    @cached_call(
+        "feedback",
+        ttl=timedelta(days=7),
+        temperature=0.3,
+        should_cache=_is_answer,
+    )
     def provide_line_by_line_feedback(self, code: str, problem: str) -> Dict[str, Any]:
         """Provide detailed line-by-line feedback on code."""
         if self.client is None:
@@ -144,8 +268,6 @@ class LLMService:
         """
         
         user_prompt = f"""
-        Problem: {problem}
-        
         Code to analyze:
         ```python
         {code}
@@ -157,42 +279,39 @@ class LLMService:
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=_messages(system_prompt, problem, user_prompt),
                 max_tokens=settings.max_tokens,
                 temperature=0.3
             )
+            _log_usage(response)
             feedback_json = response.choices[0].message.content.strip()
-            return json.loads(feedback_json)
-        except (json.JSONDecodeError, Exception) as e:
+            return fastjson.loads(feedback_json)
+        except (fastjson.JSONDecodeError, Exception) as e:
             # Retry once with a safe default model if configured model fails
             try:
                 fallback_model = "gpt-4o-mini"
                 if self.model != fallback_model:
                     response = self.client.chat.completions.create(
                         model=fallback_model,
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt}
-                        ],
+                        messages=_messages(system_prompt, problem, user_prompt),
                         max_tokens=settings.max_tokens,
                         temperature=0.3
                     )
+                    _log_usage(response)
                     feedback_json = response.choices[0].message.content.strip()
-                    return json.loads(feedback_json)
+                    return fastjson.loads(feedback_json)
             except Exception:
                 pass
-            return {
-                "overall_feedback": f"Unable to analyze code at this time (LLM error).",
+            return _Fallback({
+                "overall_feedback": _LLM_ERROR_FEEDBACK,
                 "line_feedback": {},
                 "suggestions": [],
                 "patterns_used": [],
                 "time_complexity": "Unknown",
                 "space_complexity": "Unknown",
-            }
+            })
     
+    @cached_call("hint", ttl=timedelta(hours=1), temperature=0.7)
     def generate_hint(self, problem: str, current_code: str, hint_level: int = 1) -> str:
         """Generate progressive hints based on problem and current code."""
         if self.client is None:
@@ -203,32 +322,191 @@ class LLMService:
             3: "Provide a clearer direction including key insights needed to solve the problem."
         }
         
-        system_prompt = f"""You are a helpful algorithm tutor. {hint_prompts.get(hint_level, hint_prompts[1])}
+        system_prompt = """You are a helpful algorithm tutor.
         
         Focus on guiding the student's thinking rather than providing complete solutions.
         Be encouraging and educational in your response."""
         
         user_prompt = f"""
-        Problem: {problem}
         Student's current attempt:
         ```python
         {current_code}
         ```
         
-        Provide a hint at level {hint_level}.
+        Provide a hint at level {hint_level}: {hint_prompts.get(hint_level, hint_prompts[1])}
         """
         
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+        return self._complete(
+            _messages(system_prompt, problem, user_prompt),
             max_tokens=300,
-            temperature=0.7
+            temperature=0.7,
         )
+
+    def _bundle_messages(self, code: str, problem: str, hint_level: int) -> List[Dict[str, str]]:
+        """Build the messages for the batched Socratic/hint/review request."""
+        hint_prompts = {
+            1: "a subtle hint about the approach without giving away the solution",
+            2: "a more direct hint about the algorithm or data structure to use",
+            3: "a clearer direction including key insights needed to solve the problem"
+        }
+
+        system_prompt = """You are a Socratic algorithm tutor reviewing a student's code.
+        Answer every labeled question below about the same problem and code.
+        Guide the student's thinking rather than providing complete solutions.
         
-        return response.choices[0].message.content.strip()
+        Return only JSON with this structure:
+        {
+            "socratic_question": "Answer to Q1",
+            "hint": "Answer to Q2",
+            "overall_feedback": "Answer to Q3",
+            "time_complexity": "O(n)",
+            "space_complexity": "O(1)",
+            "patterns_used": ["pattern1", "pattern2"]
+        }
+        """
+        
+        user_prompt = f"""
+        Student's current code:
+        ```python
+        {code}
+        ```
+        
+        [Q1] Ask one focused Socratic question that helps the student reason about their approach.
+        [Q2] Give {hint_prompts.get(hint_level, hint_prompts[1])}.
+        [Q3] Assess correctness, efficiency, style and edge case handling, then state the
+        time/space complexity and the algorithm patterns used.
+        """
+        return _messages(system_prompt, problem, user_prompt)
+
+    def _offline_bundle(self, code: str, problem: str, hint_level: int) -> Dict[str, Any]:
+        # Each helper short-circuits to its offline default
+        return {
+            "socratic_question": self.generate_socratic_question(code, problem, ""),
+            "hint": self.generate_hint(problem, code, hint_level),
+            **self.provide_line_by_line_feedback(code, problem),
+            "patterns_used": self.analyze_code_patterns(code),
+        }
+
+    def _parse_bundle(self, response: Any) -> Dict[str, Any]:
+        _log_usage(response)
+        try:
+            return self._parse_bundle_text(response.choices[0].message.content)
+        except Exception:
+            return _Fallback(_BUNDLE_FALLBACK)
+
+    def _parse_bundle_text(self, text: str) -> Dict[str, Any]:
+        try:
+            bundle = fastjson.loads(text.strip())
+            if isinstance(bundle, dict):
+                return bundle
+        except fastjson.JSONDecodeError:
+            pass
+        return _Fallback(_BUNDLE_FALLBACK)
+
+    @cached_call(
+        "bundle",
+        ttl=timedelta(days=7),
+        temperature=0.3,
+        should_cache=_is_bundle,
+    )
+    def generate_bundle(self, code: str, problem: str, hint_level: int = 1) -> Dict[str, Any]:
+        """Generate the Socratic question, hint and review in a single request.
+
+        Returns a dict with ``socratic_question``, ``hint``, ``overall_feedback``,
+        ``time_complexity``, ``space_complexity`` and ``patterns_used``.
+        """
+        if self.client is None:
+            return self._offline_bundle(code, problem, hint_level)
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._bundle_messages(code, problem, hint_level),
+                max_tokens=settings.max_tokens,
+                temperature=0.3,
+                response_format=_JSON_OBJECT
+            )
+        except Exception:
+            return _Fallback(_BUNDLE_FALLBACK)
+        return self._parse_bundle(response)
+
+    @cached_call(
+        "bundle",
+        ttl=timedelta(days=7),
+        temperature=0.3,
+        should_cache=_is_bundle,
+        exclude=("on_delta",),
+    )
+    def generate_bundle_stream(
+        self,
+        code: str,
+        problem: str,
+        hint_level: int = 1,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Streaming variant of ``generate_bundle``; shares its cache entries.
+
+        ``on_delta`` receives each chunk of the raw JSON response as it
+        arrives; cache hits and offline answers return without calling it.
+        """
+        if self.client is None:
+            return self._offline_bundle(code, problem, hint_level)
+        parts: List[str] = []
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._bundle_messages(code, problem, hint_level),
+                max_tokens=settings.max_tokens,
+                temperature=0.3,
+                response_format=_JSON_OBJECT,
+                stream=True
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    if on_delta is not None:
+                        on_delta(delta)
+        except Exception:
+            return _Fallback(_BUNDLE_FALLBACK)
+        return self._parse_bundle_text("".join(parts))
+
+    @cached_call(
+        "bundle",
+        ttl=timedelta(days=7),
+        temperature=0.3,
+        should_cache=_is_bundle,
+    )
+    async def generate_bundle_async(
+        self, code: str, problem: str, hint_level: int = 1
+    ) -> Dict[str, Any]:
+        """Async variant of ``generate_bundle``; shares its cache entries."""
+        if self.client is None:
+            return self._offline_bundle(code, problem, hint_level)
+        sdk = _openai()
+        if sdk is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, functools.partial(self.generate_bundle, code, problem, hint_level)
+            )
+        try:
+            # A fresh client per call: its connection pool is bound to the running loop
+            async with sdk.AsyncOpenAI(api_key=settings.openai_api_key) as client:
+                response = await client.chat.completions.create(
+                    model=self.model,
+                    messages=self._bundle_messages(code, problem, hint_level),
+                    max_tokens=settings.max_tokens,
+                    temperature=0.3,
+                    response_format=_JSON_OBJECT
+                )
+        except Exception:
+            return _Fallback(_BUNDLE_FALLBACK)
+        return self._parse_bundle(response)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return response cache hit/miss counters and entry count."""
+        return llm_cache.stats()
 
 
 # Global LLM service instance
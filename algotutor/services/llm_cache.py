@@ -0,0 +1,162 @@
+"""LLM response cache for CB Algorithm Tutor."""
+
+import functools
+import hashlib
+import inspect
+import json
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from algotutor.core.config import settings
+from algotutor.models import LLMCacheEntry
+
+# Responses sampled above this temperature are meant to vary; never cache them
+MAX_CACHEABLE_TEMPERATURE = 0.3
+
+
+class LLMResponseCache:
+    """Exact-match cache for LLM responses.
+
+    Entries live in the ``llm_cache`` table on the application database, so
+    repeated requests across sessions skip the network round-trip.
+    """
+
+    def __init__(self, engine=None):
+        self._engine = engine
+        self._session_factory = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_session(self):
+        if self._session_factory is None:
+            engine = self._engine
+            if engine is None:
+                from algotutor.services.database import db_service
+
+                engine = db_service.engine
+            self._session_factory = sessionmaker(bind=engine)
+        return self._session_factory()
+
+    def make_key(self, *parts: Any) -> str:
+        """Build a cache key from the parts that determine a response."""
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, ttl: Optional[timedelta] = None) -> Optional[Any]:
+        """Return the cached response for a key, or None on a miss or expiry."""
+        try:
+            with self._get_session() as session:
+                entry = session.get(LLMCacheEntry, key)
+                if entry is not None and (
+                    ttl is None or entry.created_at >= datetime.utcnow() - ttl
+                ):
+                    self.hits += 1
+                    return entry.response
+        except SQLAlchemyError:
+            pass
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store or replace a response; caching is best-effort."""
+        try:
+            with self._get_session() as session:
+                session.merge(
+                    LLMCacheEntry(key=key, response=value, created_at=datetime.utcnow())
+                )
+                session.commit()
+        except SQLAlchemyError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the number of stored entries."""
+        entries = 0
+        try:
+            with self._get_session() as session:
+                entries = session.query(LLMCacheEntry).count()
+        except SQLAlchemyError:
+            pass
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+# Global LLM response cache instance
+llm_cache = LLMResponseCache()
+
+
+def cached_call(
+    kind: str,
+    ttl: timedelta,
+    temperature: Optional[float] = None,
+    should_cache: Optional[Callable[[Any], bool]] = None,
+    exclude: Tuple[str, ...] = (),
+):
+    """Cache an ``LLMService`` method's result in ``llm_cache``.
+
+    The key covers the model, temperature, ``kind`` and the bound call
+    arguments. ``temperature`` is the sampling temperature the method uses
+    (``settings.temperature`` when None); calls above
+    ``MAX_CACHEABLE_TEMPERATURE`` and offline calls bypass the cache, and
+    ``should_cache`` can reject results such as error fallbacks. Arguments
+    named in ``exclude`` (such as progress callbacks) are left out of the key.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def lookup(self, args, kwargs):
+            """Return (hit, result, store) for a call; ``store`` records a fresh result."""
+            temp = settings.temperature if temperature is None else temperature
+            if self.client is None or temp > MAX_CACHEABLE_TEMPERATURE:
+                return False, None, lambda result: None
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            call_args = {
+                k: v for k, v in bound.arguments.items() if k != "self" and k not in exclude
+            }
+            key = llm_cache.make_key(self.model, temp, kind, call_args)
+
+            cached = llm_cache.get(key, ttl=ttl)
+            if cached is not None:
+                return True, cached, None
+
+            def store(result):
+                if should_cache is None or should_cache(result):
+                    llm_cache.set(key, result)
+
+            return False, None, store
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                hit, result, store = lookup(self, args, kwargs)
+                if hit:
+                    return result
+                result = await func(self, *args, **kwargs)
+                store(result)
+                return result
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                hit, result, store = lookup(self, args, kwargs)
+                if hit:
+                    return result
+                result = func(self, *args, **kwargs)
+                store(result)
+                return result
+
+        return wrapper
+
+    return decorator
@@ -1,18 +1,24 @@
 """Simplified CB Algorithm Tutor - Core functionality without external dependencies."""
 
+import ast
+import atexit
 import json
 import os
+import re
 import sys
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-import ast
-import tempfile
-import subprocess
-import time
+from functools import lru_cache
+import zlib
 
 
-@dataclass
+_TEMPLATE_FUNCTION = re.compile(r"^def\s+(\w+)", re.MULTILINE)
+
+
+@dataclass(frozen=True)
 class Problem:
     id: int
     title: str
@@ -23,6 +29,13 @@ class Problem:
     solution_template: str
     test_cases: List[Dict[str, Any]]
     hints: List[str]
+    # Name of the function the template asks for; read from it when omitted
+    function_name: Optional[str] = None
+
+    def __post_init__(self):
+        if self.function_name is None:
+            match = _TEMPLATE_FUNCTION.search(self.solution_template)
+            object.__setattr__(self, "function_name", match.group(1) if match else None)
 
 
 @dataclass
@@ -33,7 +46,7 @@ class User:
     current_streak: int = 0
 
 
-@dataclass
+@dataclass(frozen=True)
 class Attempt:
     user: str
     problem_id: int
@@ -44,17 +57,37 @@ class Attempt:
 
 
 class SimpleStorage:
-    """Simple JSON file-based storage."""
+    """Simple JSON file-based storage.
+
+    Writes are buffered per instance and go to disk on ``flush()``: at
+    session end, at interpreter exit, or once ``FLUSH_EVERY`` attempts are
+    pending.
+    """
+
+    FLUSH_EVERY = 16
+    # Data directories already created by this process
+    _dirs_created: Set[str] = set()
+    # Instances holding unwritten data; flush_all() empties it at exit
+    _pending: Set["SimpleStorage"] = set()
     
     def __init__(self, data_dir: str = "cb_data"):
         self.data_dir = data_dir
-        os.makedirs(data_dir, exist_ok=True)
+        if data_dir not in SimpleStorage._dirs_created:
+            os.makedirs(data_dir, exist_ok=True)
+            SimpleStorage._dirs_created.add(data_dir)
+        self._dirty_users: Dict[str, Dict[str, Any]] = {}
+        self._attempt_buffer: List[Attempt] = []
+        self._bulk_depth = 0
         
     def save_user(self, user: User):
-        with open(f"{self.data_dir}/user_{user.username}.json", 'w') as f:
-            json.dump(asdict(user), f, indent=2)
+        # Only the latest state of each user needs writing; a shallow copy
+        # suffices since every field is a primitive
+        self._dirty_users[user.username] = dict(vars(user))
+        SimpleStorage._pending.add(self)
             
     def load_user(self, username: str) -> Optional[User]:
+        if username in self._dirty_users:
+            return User(**self._dirty_users[username])
         try:
             with open(f"{self.data_dir}/user_{username}.json", 'r') as f:
                 data = json.load(f)
@@ -63,23 +96,101 @@ class SimpleStorage:
             return None
     
     def save_attempt(self, attempt: Attempt):
-        filename = f"{self.data_dir}/attempts_{attempt.user}.json"
-        attempts = []
+        self._attempt_buffer.append(attempt)
+        SimpleStorage._pending.add(self)
+        if not self._bulk_depth and len(self._attempt_buffer) >= self.FLUSH_EVERY:
+            self.flush()
+
+    @contextmanager
+    def bulk(self):
+        """Hold every write until the outermost ``bulk()`` block exits."""
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                self.flush()
+    
+    def load_attempts(self, username: str) -> Iterator[Dict[str, Any]]:
+        """Yield a user's saved attempts, oldest first."""
+        # Attempts saved before the switch to JSON Lines
         try:
-            with open(filename, 'r') as f:
-                attempts = json.load(f)
+            with open(f"{self.data_dir}/attempts_{username}.json", 'r') as f:
+                yield from json.load(f)
         except FileNotFoundError:
             pass
-        
-        attempts.append(asdict(attempt))
-        with open(filename, 'w') as f:
-            json.dump(attempts, f, indent=2)
+        try:
+            with open(f"{self.data_dir}/attempts_{username}.jsonl", 'r') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            pass
+        for attempt in list(self._attempt_buffer):
+            if attempt.user == username:
+                yield dict(vars(attempt))
+
+    def flush(self):
+        """Write buffered users and attempts, one file open per user."""
+        SimpleStorage._pending.discard(self)
+        users, self._dirty_users = self._dirty_users, {}
+        for username, data in users.items():
+            # Compact JSON, swapped in atomically so a crash never leaves half a file
+            path = f"{self.data_dir}/user_{username}.json"
+            with open(path + ".tmp", 'w') as f:
+                f.write(json.dumps(data, separators=(",", ":")))
+            os.replace(path + ".tmp", path)
+
+        attempts, self._attempt_buffer = self._attempt_buffer, []
+        by_user: Dict[str, List[str]] = {}
+        for attempt in attempts:
+            # vars() skips asdict()'s deep copy of the nested feedback dict
+            by_user.setdefault(attempt.user, []).append(json.dumps(vars(attempt)) + "\n")
+        for username, lines in by_user.items():
+            # JSON Lines: append new records instead of rewriting history
+            with open(f"{self.data_dir}/attempts_{username}.jsonl", 'a') as f:
+                f.writelines(lines)
+
+    @classmethod
+    def flush_all(cls):
+        """Flush every instance with buffered writes."""
+        for storage in list(cls._pending):
+            storage.flush()
+
+
+atexit.register(SimpleStorage.flush_all)
+
+
+@lru_cache(maxsize=128)
+def parse_user_code(code: str) -> ast.Module:
+    """Parse a submission once; execution, function lookup and pattern
+    analysis all share the tree, which callers must not modify."""
+    return ast.parse(code)
+
+
+@lru_cache(maxsize=128)
+def _compile_user_code(code: str):
+    # Resubmitting the same solution skips parsing and compiling
+    return compile(parse_user_code(code), "<user>", "exec")
+
+
+def _first_function_name(code: str) -> Optional[str]:
+    for node in parse_user_code(code).body:
+        if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
+            return node.name
+    return None
 
 
 class SimpleCodeExecutor:
     """Simple code execution without external dependencies."""
     
-    def execute_python_code(self, code: str, test_cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def execute_python_code(
+        self,
+        code: str,
+        test_cases: List[Dict[str, Any]],
+        function_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
         results = {
             "success": False,
             "output": "",
@@ -88,9 +199,9 @@ class SimpleCodeExecutor:
             "syntax_valid": False
         }
         
-        # Check syntax
+        # Check syntax; the code object is reused for execution below
         try:
-            ast.parse(code)
+            code_obj = _compile_user_code(code)
             results["syntax_valid"] = True
         except SyntaxError as e:
             results["errors"] = f"Syntax Error: {str(e)}"
@@ -100,14 +211,16 @@ class SimpleCodeExecutor:
         try:
             exec_globals = {"__builtins__": __builtins__}
             exec_locals = {}
-            exec(code, exec_globals, exec_locals)
+            exec(code_obj, exec_globals, exec_locals)
             
-            # Find the main function
-            main_function = None
-            for name, obj in exec_locals.items():
-                if callable(obj) and not name.startswith('_'):
-                    main_function = obj
-                    break
+            # Find the main function: the expected name, else the first def
+            main_function = exec_locals.get(function_name or _first_function_name(code))
+            if not callable(main_function):
+                main_function = None
+                for name, obj in exec_locals.items():
+                    if callable(obj) and not name.startswith('_'):
+                        main_function = obj
+                        break
             
             if main_function is None:
                 results["errors"] = "No callable function found in code"
@@ -115,11 +228,12 @@ class SimpleCodeExecutor:
             
             # Run test cases
             passed_tests = 0
+            n = len(test_cases)
+            append_result = results["test_results"].append
             for i, test_case in enumerate(test_cases):
+                input_args = test_case.get("input", [])
+                expected_output = test_case.get("expected", None)
                 try:
-                    input_args = test_case.get("input", [])
-                    expected_output = test_case.get("expected", None)
-                    
                     if isinstance(input_args, list) and len(input_args) > 0:
                         if isinstance(input_args[0], list):
                             actual_output = main_function(*input_args)
@@ -132,7 +246,7 @@ class SimpleCodeExecutor:
                     if test_passed:
                         passed_tests += 1
                     
-                    results["test_results"].append({
+                    append_result({
                         "test_case": i + 1,
                         "input": input_args,
                         "expected": expected_output,
@@ -141,7 +255,7 @@ class SimpleCodeExecutor:
                     })
                     
                 except Exception as e:
-                    results["test_results"].append({
+                    append_result({
                         "test_case": i + 1,
                         "input": input_args,
                         "expected": expected_output,
@@ -150,8 +264,8 @@ class SimpleCodeExecutor:
                         "error": str(e)
                     })
             
-            results["success"] = passed_tests == len(test_cases)
-            results["output"] = f"Passed {passed_tests}/{len(test_cases)} test cases"
+            results["success"] = passed_tests == n
+            results["output"] = f"Passed {passed_tests}/{n} test cases"
             
         except Exception as e:
             results["errors"] = str(e)
@@ -159,86 +273,139 @@ class SimpleCodeExecutor:
         return results
 
 
+_SOCRATIC_QUESTIONS = (
+    "What data structure might be most efficient for this problem?",
+    "Can you identify the time complexity of your current approach?",
+    "Are there any edge cases you haven't considered?",
+    "Could you solve this with a different algorithm pattern?",
+    "What's the space-time tradeoff in your solution?"
+)
+
+
+_PATTERN_TOKENS = re.compile(r"\b(?:for|while|def|range|dict)\b|[\[\]{]")
+
+
+@lru_cache(maxsize=256)
+def _detect_patterns(code: str) -> Tuple[str, ...]:
+    # Called again for the same code on each submit; tuples are safe to share
+    try:
+        tree = parse_user_code(code)
+    except SyntaxError:
+        return _scan_patterns(code)
+
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.For):
+            if isinstance(node.iter, ast.Call) and getattr(node.iter.func, "id", None) == "range":
+                found.add("iteration")
+        elif isinstance(node, ast.While):
+            found.add("while_loop")
+        elif isinstance(node, ast.FunctionDef):
+            if any(
+                isinstance(inner, ast.Call) and getattr(inner.func, "id", None) == node.name
+                for inner in ast.walk(node)
+            ):
+                found.add("recursion")
+        elif isinstance(node, ast.Subscript):
+            found.add("array_access")
+        elif isinstance(node, (ast.Dict, ast.DictComp)) or (
+            isinstance(node, ast.Call) and getattr(node.func, "id", None) == "dict"
+        ):
+            found.add("hash_table")
+    order = ("iteration", "while_loop", "recursion", "array_access", "hash_table")
+    return tuple(name for name in order if name in found)
+
+
+def _scan_patterns(code: str) -> Tuple[str, ...]:
+    # Keyword scan for code that does not parse
+    counts = Counter(m.group() for m in _PATTERN_TOKENS.finditer(code))
+    patterns = []
+    if counts["for"] and counts["range"]:
+        patterns.append("iteration")
+    if counts["while"]:
+        patterns.append("while_loop")
+    if counts["def"] > 1:
+        patterns.append("recursion")
+    if counts["["] and counts["]"]:
+        patterns.append("array_access")
+    if counts["dict"] or counts["{"]:
+        patterns.append("hash_table")
+    return tuple(patterns)
+
+
 class SimpleFeedbackGenerator:
     """Simple feedback generation without LLM."""
     
     def generate_socratic_question(self, code: str, problem: str) -> str:
-        questions = [
-            "What data structure might be most efficient for this problem?",
-            "Can you identify the time complexity of your current approach?",
-            "Are there any edge cases you haven't considered?",
-            "Could you solve this with a different algorithm pattern?",
-            "What's the space-time tradeoff in your solution?"
-        ]
-        return questions[hash(code) % len(questions)]
+        # crc32 is stable across runs, unlike the salted str hash
+        index = zlib.crc32(code.encode("utf-8", "ignore")) % len(_SOCRATIC_QUESTIONS)
+        return _SOCRATIC_QUESTIONS[index]
     
     def analyze_patterns(self, code: str) -> List[str]:
-        patterns = []
-        if "for" in code and "range" in code:
-            patterns.append("iteration")
-        if "while" in code:
-            patterns.append("while_loop")
-        if "def " in code and code.count("def ") > 1:
-            patterns.append("recursion")
-        if "[" in code and "]" in code:
-            patterns.append("array_access")
-        if "dict" in code or "{" in code:
-            patterns.append("hash_table")
-        return patterns
+        return list(_detect_patterns(code))
     
     def provide_feedback(self, code: str, results: Dict[str, Any]) -> str:
         if results["success"]:
             return "Great job! Your solution passes all test cases. Consider if you can optimize for time or space complexity."
         else:
-            failed_tests = [t for t in results["test_results"] if not t["passed"]]
-            if failed_tests:
-                return f"Some test cases failed. Check test case {failed_tests[0]['test_case']}: expected {failed_tests[0]['expected']} but got {failed_tests[0]['actual']}"
+            first_failed = next((t for t in results["test_results"] if not t["passed"]), None)
+            if first_failed is not None:
+                return f"Some test cases failed. Check test case {first_failed['test_case']}: expected {first_failed['expected']} but got {first_failed['actual']}"
             else:
                 return "There seems to be an issue with your code logic. Review the problem requirements."
 
 
+_MAIN_MENU = ["\nOptions:", "1. Solve a problem", "2. View progress", "3. Quit"]
+_PROBLEM_MENU = [
+    "\nOptions:",
+    "1. Write/Edit solution",
+    "2. Get hint",
+    "3. Submit solution",
+    "4. Back to main menu",
+]
+
+
+def _emit(lines: List[str]):
+    # One write per block instead of one print() per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 class CBAlgorithmTutor:
     """Main tutor application."""
-    
-    def __init__(self):
-        self.storage = SimpleStorage()
-        self.executor = SimpleCodeExecutor()
-        self.feedback = SimpleFeedbackGenerator()
-        self.sample_problems = self._create_sample_problems()
-        
-    def _create_sample_problems(self) -> List[Problem]:
-        return [
-            Problem(
-                id=1,
-                title="Two Sum",
-                description="""Given an array of integers nums and an integer target, 
+
+    # Built once at import and shared by every tutor instance
+    SAMPLE_PROBLEMS = [
+        Problem(
+            id=1,
+            title="Two Sum",
+            description="""Given an array of integers nums and an integer target, 
 return indices of the two numbers such that they add up to target.
 
 Example:
 Input: nums = [2,7,11,15], target = 9
 Output: [0,1]
 Explanation: Because nums[0] + nums[1] == 9, we return [0, 1].""",
-                difficulty="easy",
-                category="Arrays",
-                patterns=["hash_table", "two_pointer"],
-                solution_template="""def twoSum(nums, target):
+            difficulty="easy",
+            category="Arrays",
+            patterns=["hash_table", "two_pointer"],
+            solution_template="""def twoSum(nums, target):
     # Your solution here
     pass""",
-                test_cases=[
-                    {"input": [[2, 7, 11, 15], 9], "expected": [0, 1]},
-                    {"input": [[3, 2, 4], 6], "expected": [1, 2]},
-                    {"input": [[3, 3], 6], "expected": [0, 1]}
-                ],
-                hints=[
-                    "Consider what data structure can help you find complements efficiently",
-                    "Hash maps provide O(1) lookup time",
-                    "Store each number with its index as you iterate"
-                ]
-            ),
-            Problem(
-                id=2,
-                title="Valid Parentheses",
-                description="""Given a string s containing just the characters '(', ')', '{', '}', '[' and ']',
+            test_cases=[
+                {"input": [[2, 7, 11, 15], 9], "expected": [0, 1]},
+                {"input": [[3, 2, 4], 6], "expected": [1, 2]},
+                {"input": [[3, 3], 6], "expected": [0, 1]}
+            ],
+            hints=[
+                "Consider what data structure can help you find complements efficiently",
+                "Hash maps provide O(1) lookup time",
+                "Store each number with its index as you iterate"
+            ]
+        ),
+        Problem(
+            id=2,
+            title="Valid Parentheses",
+            description="""Given a string s containing just the characters '(', ')', '{', '}', '[' and ']',
 determine if the input string is valid.
 
 An input string is valid if:
@@ -248,25 +415,31 @@ An input string is valid if:
 Example:
 Input: s = "()[]{}"
 Output: true""",
-                difficulty="easy",
-                category="Stack",
-                patterns=["stack"],
-                solution_template="""def isValid(s):
+            difficulty="easy",
+            category="Stack",
+            patterns=["stack"],
+            solution_template="""def isValid(s):
     # Your solution here
     pass""",
-                test_cases=[
-                    {"input": ["()"], "expected": True},
-                    {"input": ["()[]{})"], "expected": True},
-                    {"input": ["(]"], "expected": False}
-                ],
-                hints=[
-                    "Think about Last In, First Out (LIFO) data structure",
-                    "Use a stack to keep track of opening brackets",
-                    "Match closing brackets with the most recent opening bracket"
-                ]
-            )
-        ]
-    
+            test_cases=[
+                {"input": ["()"], "expected": True},
+                {"input": ["()[]{})"], "expected": True},
+                {"input": ["(]"], "expected": False}
+            ],
+            hints=[
+                "Think about Last In, First Out (LIFO) data structure",
+                "Use a stack to keep track of opening brackets",
+                "Match closing brackets with the most recent opening bracket"
+            ]
+        )
+    ]
+
+    def __init__(self):
+        self.storage = SimpleStorage()
+        self.executor = SimpleCodeExecutor()
+        self.feedback = SimpleFeedbackGenerator()
+        self.sample_problems = type(self).SAMPLE_PROBLEMS
+        
     def start_session(self, username: str):
         """Start an interactive tutoring session."""
         print(f"\n🎯 Welcome to CB Algorithm Tutor, {username}!")
@@ -281,29 +454,30 @@ Output: true""",
             self.storage.save_user(user)
             print(f"Created new profile for {username}")
         
-        while True:
-            print("\nOptions:")
-            print("1. Solve a problem")
-            print("2. View progress")
-            print("3. Quit")
+        try:
+            while True:
+                _emit(_MAIN_MENU)
             
-            choice = input("Choose an option (1-3): ").strip()
+                choice = input("Choose an option (1-3): ").strip()
             
-            if choice == "1":
-                self.solve_problem(user)
-            elif choice == "2":
-                self.show_progress(user)
-            elif choice == "3":
-                print("Happy learning! 👋")
-                break
-            else:
-                print("Invalid choice. Please try again.")
+                if choice == "1":
+                    self.solve_problem(user)
+                elif choice == "2":
+                    self.show_progress(user)
+                elif choice == "3":
+                    print("Happy learning! 👋")
+                    break
+                else:
+                    print("Invalid choice. Please try again.")
+        finally:
+            self.storage.flush()
     
     def solve_problem(self, user: User):
         """Interactive problem solving."""
-        print("\nAvailable Problems:")
+        lines = ["\nAvailable Problems:"]
         for i, problem in enumerate(self.sample_problems):
-            print(f"{i + 1}. {problem.title} ({problem.difficulty})")
+            lines.append(f"{i + 1}. {problem.title} ({problem.difficulty})")
+        _emit(lines)
         
         try:
             choice = int(input("Choose a problem (1-2): ")) - 1
@@ -316,25 +490,23 @@ Output: true""",
     
     def work_on_problem(self, user: User, problem: Problem):
         """Work on a specific problem."""
-        print(f"\n{'=' * 60}")
-        print(f"Problem: {problem.title}")
-        print(f"Difficulty: {problem.difficulty} | Category: {problem.category}")
-        print(f"Patterns: {', '.join(problem.patterns)}")
-        print("=" * 60)
-        print("\nDescription:")
-        print(problem.description)
-        print("\nStarting template:")
-        print(problem.solution_template)
-        print("=" * 60)
+        _emit([
+            f"\n{'=' * 60}",
+            f"Problem: {problem.title}",
+            f"Difficulty: {problem.difficulty} | Category: {problem.category}",
+            f"Patterns: {', '.join(problem.patterns)}",
+            "=" * 60,
+            "\nDescription:",
+            problem.description,
+            "\nStarting template:",
+            problem.solution_template,
+            "=" * 60,
+        ])
         
         hint_count = 0
         
         while True:
-            print("\nOptions:")
-            print("1. Write/Edit solution")
-            print("2. Get hint")
-            print("3. Submit solution")
-            print("4. Back to main menu")
+            _emit(_PROBLEM_MENU)
             
             choice = input("Choose an option (1-4): ").strip()
             
@@ -363,7 +535,16 @@ Output: true""",
                 print("Invalid choice. Please try again.")
     
     def get_code_input(self) -> str:
-        """Get code input from user."""
+        """Get code input from user.
+
+        On a TTY the whole block is read in one call, terminated by EOF;
+        piped stdin also carries the menu answers, so it is read by line.
+        """
+        if sys.stdin.isatty():
+            eof_key = "Ctrl-Z then Enter" if os.name == "nt" else "Ctrl-D"
+            print(f"\nEnter your solution (press {eof_key} when done):")
+            return sys.stdin.read().rstrip()
+
         print("\nEnter your solution (press Enter twice when done):")
         lines = []
         empty_lines = 0
@@ -386,7 +567,9 @@ Output: true""",
         """Submit and evaluate solution."""
         print("\n⚡ Testing your solution...")
         
-        results = self.executor.execute_python_code(code, problem.test_cases)
+        results = self.executor.execute_python_code(
+            code, problem.test_cases, problem.function_name
+        )
         
         # Display results
         if not results["syntax_valid"]:
@@ -397,11 +580,11 @@ Output: true""",
             user.current_streak += 1
             self.storage.save_user(user)
         else:
-            print(f"📊 Test Results: {results['output']}")
-            print("\nDetailed Results:")
+            lines = [f"📊 Test Results: {results['output']}", "\nDetailed Results:"]
             for test in results["test_results"]:
                 status = "✅" if test["passed"] else "❌"
-                print(f"  {status} Test {test['test_case']}: input={test['input']}, expected={test['expected']}, got={test.get('actual', 'Error')}")
+                lines.append(f"  {status} Test {test['test_case']}: input={test['input']}, expected={test['expected']}, got={test.get('actual', 'Error')}")
+            _emit(lines)
         
         # Provide feedback
         feedback_text = self.feedback.provide_feedback(code, results)
@@ -424,11 +607,13 @@ Output: true""",
     
     def show_progress(self, user: User):
         """Show user progress."""
-        print(f"\n📈 Progress for {user.username}")
-        print("=" * 40)
-        print(f"Problems solved: {user.problems_solved}")
-        print(f"Current streak: {user.current_streak}")
-        print(f"Member since: {user.created_at[:10]}")
+        _emit([
+            f"\n📈 Progress for {user.username}",
+            "=" * 40,
+            f"Problems solved: {user.problems_solved}",
+            f"Current streak: {user.current_streak}",
+            f"Member since: {user.created_at[:10]}",
+        ])
 
 
 def main():
@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from click.testing import CliRunner
+
+_DB_DIR = tempfile.mkdtemp(prefix="algotutor-tests-")
+
+
+def pytest_configure(config):
+    # Settings are read once, when test modules import algotutor during
+    # collection; point them at a temp database and a dummy OpenAI key first
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'cb_tutor_test.db')}"
+    os.environ["OPENAI_API_KEY"] = os.environ.get("OPENAI_API_KEY", "test-123")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """One CliRunner for the whole run; each invoke still isolates its streams."""
+    return CliRunner()
+
+
+@pytest.fixture(scope="session")
+def initialized_db(runner):
+    """The test database after ``--init``; runs once and is shared by the CLI tests."""
+    from algotutor.cli.main import main
+
+    init_result = runner.invoke(main, ["--init"])
+    assert init_result.exit_code == 0, init_result.output
+    assert "Initialization complete" in init_result.output
+    return os.environ["DATABASE_URL"]
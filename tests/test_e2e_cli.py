@@ -1,24 +1,8 @@
-import os
-import importlib
-from click.testing import CliRunner
+from algotutor.cli.main import main
 
 
-def test_e2e_init_and_quit(monkeypatch, tmp_path):
-    # Point DB to a temp file and set a dummy OpenAI key before importing
-    db_file = tmp_path / "cb_tutor_test.db"
-    os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
-    os.environ["OPENAI_API_KEY"] = os.environ.get("OPENAI_API_KEY", "test-123")
-
-    # Import CLI after env is set
-    cli_main_mod = importlib.import_module("algotutor.cli.main")
-    main = getattr(cli_main_mod, "main")
-
-    runner = CliRunner()
-
-    # Initialize database and sample data
-    init_result = runner.invoke(main, ["--init"])
-    assert init_result.exit_code == 0, init_result.output
-    assert "Initialization complete" in init_result.output
+def test_e2e_init_and_quit(runner, initialized_db):
+    # The shared fixture has already run --init against a temp database
 
     # Start a session, visit a problem, request hints, back out, then quit
     # Sequence of inputs for interactive prompts
@@ -0,0 +1,77 @@
+from algotutor.services.execution import code_execution_service
+
+
+def test_cases_run_in_order_with_shared_state():
+    # The mutable default carries over between cases, so only an in-order run passes
+    code = (
+        "def running_total(x, seen=[]):\n"
+        "    seen.append(x)\n"
+        "    return sum(seen)\n"
+    )
+    cases = [{"input": [n], "expected": e} for n, e in [(1, 1), (2, 3), (3, 6), (4, 10)]]
+
+    results = code_execution_service.execute_python_code(code, cases)
+
+    assert results["output"] == "Passed 4/4 test cases"
+    assert [r["test_case"] for r in results["test_results"]] == [1, 2, 3, 4]
+
+
+def test_run_with_timeout_isolates_runs():
+    first = code_execution_service.run_with_timeout("import os, sys\nos.chdir('/')\nsys.leak = 42\n")
+    second = code_execution_service.run_with_timeout(
+        "import sys\nprint(hasattr(sys, 'leak'))\n", timeout=30
+    )
+
+    assert first["success"]
+    assert second["output"].strip() == "False"
+
+
+def test_large_stateful_suite_keeps_state_across_cases():
+    # Suites of any size share one loaded function and run in order
+    code = (
+        "def running_total(x, seen=[]):\n"
+        "    seen.append(x)\n"
+        "    return sum(seen)\n"
+    )
+    cases = [{"input": [n], "expected": n * (n + 1) // 2} for n in range(1, 13)]
+    cases[5]["expected"] = -1
+
+    results = code_execution_service.execute_python_code(code, cases)
+
+    assert results["output"] == "Passed 11/12 test cases"
+    assert [r["test_case"] for r in results["test_results"]] == list(range(1, 13))
+    assert results["test_results"][5]["actual"] == 21
+
+
+def test_imports_are_reported_as_restricted_not_syntax_errors():
+    code = "from typing import List\n\ndef main(nums: List[int]):\n    return nums\n"
+
+    results = code_execution_service.execute_python_code(code, [{"input": [[1]], "expected": [1]}])
+
+    assert results["restricted"] is True
+    assert results["syntax_valid"] is False
+    assert "Syntax Error" not in results["errors"]
+    assert "import" in results["errors"]
+
+
+def test_private_attributes_and_globals_are_allowed():
+    code = (
+        "calls = 0\n"
+        "\n"
+        "class Memo:\n"
+        "    def __init__(self):\n"
+        "        self._seen = {}\n"
+        "\n"
+        "def fib(n, memo=Memo()):\n"
+        "    global calls\n"
+        "    calls += 1\n"
+        "    if n < 2:\n"
+        "        return n\n"
+        "    if n not in memo._seen:\n"
+        "        memo._seen[n] = fib(n - 1) + fib(n - 2)\n"
+        "    return memo._seen[n]\n"
+    )
+
+    results = code_execution_service.execute_python_code(code, [{"input": [10], "expected": 55}])
+
+    assert results["output"] == "Passed 1/1 test cases"
@@ -13,6 +13,7 @@ def test_curses_selector_path(monkeypatch):
     fake_curses.KEY_DOWN = 258
     fake_curses.A_REVERSE = 1
     fake_curses.KEY_ENTER = 10
+    fake_curses.KEY_RESIZE = 410
 
     events = [fake_curses.KEY_DOWN, fake_curses.KEY_DOWN, ord("\n")]  # move to index 2 and select
 
@@ -26,6 +27,15 @@ def test_curses_selector_path(monkeypatch):
         def clear(self):
             pass
 
+        def erase(self):
+            pass
+
+        def move(self, *_):
+            pass
+
+        def clrtoeol(self):
+            pass
+
         def addstr(self, *args, **kwargs):
             # Accept any write
             pass
@@ -42,6 +52,12 @@ def test_curses_selector_path(monkeypatch):
         def refresh(self):
             pass
 
+        def noutrefresh(self, *_):
+            pass
+
+        def nodelay(self, flag):
+            self.calls.append(("nodelay", flag))
+
         def getch(self):
             return events.pop(0) if events else ord("\n")
 
@@ -53,6 +69,8 @@ def test_curses_selector_path(monkeypatch):
 
     fake_curses.curs_set = curs_set
     fake_curses.wrapper = wrapper
+    fake_curses.doupdate = lambda: None
+    fake_curses.newpad = lambda nlines, ncols: FakeWin()
 
     # Install fake curses before import inside function
     monkeypatch.setitem(sys.modules, "curses", fake_curses)
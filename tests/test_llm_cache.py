@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from sqlalchemy import create_engine
+
+
+def test_cached_call_hits_and_skips_hot_temperatures(monkeypatch):
+    # Import inside the test so settings are not read before other tests set env
+    from algotutor.models import Base
+    from algotutor.services import llm_cache as cache_mod
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    cache = cache_mod.LLMResponseCache(engine=engine)
+    monkeypatch.setattr(cache_mod, "llm_cache", cache)
+
+    calls = []
+
+    class FakeService:
+        client = object()
+        model = "test-model"
+
+        @cache_mod.cached_call("feedback", ttl=timedelta(days=1), temperature=0.3)
+        def feedback(self, code, problem):
+            calls.append(code)
+            return {"overall_feedback": f"ok {len(calls)}"}
+
+        @cache_mod.cached_call("hint", ttl=timedelta(days=1), temperature=0.7)
+        def hint(self, code):
+            calls.append(code)
+            return f"hint {len(calls)}"
+
+    svc = FakeService()
+    first = svc.feedback("x = 1", "p")
+    assert svc.feedback("x = 1", problem="p") == first
+    assert svc.feedback("x = 2", "p") != first
+    assert len(calls) == 2
+
+    # Sampled responses are never served from the cache
+    assert svc.hint("x") != svc.hint("x")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["entries"] == 2
+
+
+def test_code_one_token_apart_is_not_served_from_cache(monkeypatch):
+    import types
+
+    from algotutor.models import Base
+    from algotutor.services import llm_cache as cache_mod
+    from algotutor.core import fastjson
+    from algotutor.services.llm import LLMService
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(cache_mod, "llm_cache", cache_mod.LLMResponseCache(engine=engine))
+
+    calls = []
+
+    def complete(**kwargs):
+        calls.append(kwargs["messages"][-1]["content"])
+        content = fastjson.dumps({
+            "socratic_question": "q",
+            "hint": "h",
+            "overall_feedback": "review %d" % len(calls),
+            "time_complexity": "O(1)",
+            "space_complexity": "O(1)",
+        })
+        message = types.SimpleNamespace(content=content)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    svc = LLMService()
+    svc.client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=complete)),
+    )
+    first = svc.generate_bundle("def f(a, b): return a < b", "P", 1)
+    second = svc.generate_bundle("def f(a, b): return a <= b", "P", 1)
+
+    assert len(calls) == 2
+    assert first != second
+    assert svc.generate_bundle("def f(a, b): return a < b", "P", 1) == first
+    assert len(calls) == 2
+
+
+def test_failed_or_partial_bundles_are_not_cached(monkeypatch):
+    import types
+
+    from algotutor.models import Base
+    from algotutor.services import llm_cache as cache_mod
+    from algotutor.services.llm import LLMService
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    cache = cache_mod.LLMResponseCache(engine=engine)
+    monkeypatch.setattr(cache_mod, "llm_cache", cache)
+
+    replies = iter([
+        RuntimeError("network down"),
+        "not json",
+        '{"hint": "only a hint"}',
+        '{"socratic_question": "q", "hint": "h", "overall_feedback": "ok",'
+        ' "time_complexity": "O(n)", "space_complexity": "O(1)"}',
+    ])
+    calls = []
+
+    def complete(**kwargs):
+        calls.append(kwargs)
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        message = types.SimpleNamespace(content=reply)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    svc = LLMService()
+    svc.client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=complete)),
+    )
+    code = "def f(nums): return nums"
+    for _ in range(3):
+        svc.generate_bundle(code, "P", 1)
+    assert len(calls) == 3
+    assert cache.stats()["entries"] == 0
+
+    complete_bundle = svc.generate_bundle(code, "P", 1)
+    assert svc.generate_bundle(code, "P", 1) == complete_bundle
+    assert len(calls) == 4
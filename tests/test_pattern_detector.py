@@ -0,0 +1,51 @@
+from algotutor.services.execution import PatternDetector
+
+
+def test_detects_binary_search_and_two_pointer():
+    binary_search = (
+        "def search(nums, target):\n"
+        "    lo, hi = 0, len(nums) - 1\n"
+        "    while lo <= hi:\n"
+        "        mid = (lo + hi) // 2\n"
+        "        if nums[mid] < target:\n"
+        "            lo = mid + 1\n"
+        "        else:\n"
+        "            hi = mid - 1\n"
+        "    return lo\n"
+    )
+    two_pointer = (
+        "def pair(nums, target):\n"
+        "    left, right = 0, len(nums) - 1\n"
+        "    while left < right:\n"
+        "        if nums[left] + nums[right] < target:\n"
+        "            left += 1\n"
+        "        else:\n"
+        "            right -= 1\n"
+    )
+
+    assert PatternDetector().detect(binary_search) == ["binary_search"]
+    assert PatternDetector().detect(two_pointer) == ["two_pointer"]
+    # Unparseable code yields no patterns rather than raising
+    assert PatternDetector().detect("def (:") == []
+
+
+def test_hash_map_lookup_is_not_memoization():
+    two_sum = (
+        "def twoSum(nums, target):\n"
+        "    seen = {}\n"
+        "    for i, n in enumerate(nums):\n"
+        "        if target - n in seen:\n"
+        "            return [seen[target - n], i]\n"
+        "        seen[n] = i\n"
+        "    return []\n"
+    )
+    fib = (
+        "def fib(n, memo):\n"
+        "    if n in memo:\n"
+        "        return memo[n]\n"
+        "    memo[n] = n if n < 2 else fib(n - 1, memo) + fib(n - 2, memo)\n"
+        "    return memo[n]\n"
+    )
+
+    assert PatternDetector().detect(two_sum) == []
+    assert PatternDetector().detect(fib) == ["memoization", "recursion"]
@@ -0,0 +1,117 @@
+import json
+
+from simple_tutor import Attempt, SimpleFeedbackGenerator, SimpleStorage, User
+
+
+def patterns(code):
+    return SimpleFeedbackGenerator().analyze_patterns(code)
+
+
+def test_reports_each_pattern_from_the_syntax_tree():
+    code = (
+        "def count(nums, n):\n"
+        "    seen = {}\n"
+        "    for i in range(len(nums)):\n"
+        "        seen[nums[i]] = i\n"
+        "    while n > 0:\n"
+        "        n -= 1\n"
+        "    return count(nums, n - 1) if n else len(seen)\n"
+    )
+
+    assert patterns(code) == [
+        "iteration",
+        "while_loop",
+        "recursion",
+        "array_access",
+        "hash_table",
+    ]
+
+
+def test_keywords_alone_do_not_count_as_patterns():
+    # Two functions that do not call themselves, a loop over a list rather
+    # than a range, and "while"/"dict" only in comments and strings
+    code = (
+        "def helper(x):\n"
+        "    return x + 1  # while we are here\n"
+        "\n"
+        "def solve(nums):\n"
+        "    total = 0\n"
+        "    for n in nums:\n"
+        "        total += helper(n)\n"
+        "    return 'dict' and total\n"
+    )
+
+    assert patterns(code) == []
+
+
+def test_unparseable_code_falls_back_to_a_keyword_scan():
+    code = "def f(nums:\n    for i in range(len(nums)): d = dict(x=nums[i])\ndef g(): while\n"
+
+    assert patterns(code) == ["iteration", "while_loop", "recursion", "array_access", "hash_table"]
+
+
+def attempt(user, problem_id):
+    return Attempt(user=user, problem_id=problem_id, code="pass", timestamp="t")
+
+
+def attempt_lines(path):
+    with open(path) as f:
+        return [json.loads(line)["problem_id"] for line in f]
+
+
+def test_attempts_are_appended_as_json_lines_once_the_buffer_fills(tmp_path):
+    storage = SimpleStorage(str(tmp_path))
+    path = tmp_path / "attempts_ada.jsonl"
+
+    for problem_id in range(SimpleStorage.FLUSH_EVERY - 1):
+        storage.save_attempt(attempt("ada", problem_id))
+    assert not path.exists()
+
+    storage.save_attempt(attempt("ada", 99))
+    assert attempt_lines(path)[-1] == 99
+    assert len(attempt_lines(path)) == SimpleStorage.FLUSH_EVERY
+
+    storage.save_attempt(attempt("ada", 100))
+    storage.flush()
+    assert attempt_lines(path)[-2:] == [99, 100]
+
+
+def test_bulk_holds_writes_until_the_outermost_block_exits(tmp_path):
+    storage = SimpleStorage(str(tmp_path))
+
+    with storage.bulk():
+        with storage.bulk():
+            for problem_id in range(SimpleStorage.FLUSH_EVERY + 1):
+                storage.save_attempt(attempt("ada", problem_id))
+            storage.save_user(User(username="ada", created_at="t"))
+        assert list(tmp_path.iterdir()) == []
+
+    assert len(attempt_lines(tmp_path / "attempts_ada.jsonl")) == SimpleStorage.FLUSH_EVERY + 1
+    assert json.loads((tmp_path / "user_ada.json").read_text())["username"] == "ada"
+
+
+def test_load_attempts_reads_legacy_json_then_json_lines_then_the_buffer(tmp_path):
+    (tmp_path / "attempts_ada.json").write_text(json.dumps([{"problem_id": 1}]))
+    (tmp_path / "attempts_ada.jsonl").write_text(json.dumps({"problem_id": 2}) + "\n\n")
+    storage = SimpleStorage(str(tmp_path))
+    storage.save_attempt(attempt("ada", 3))
+    storage.save_attempt(attempt("bob", 4))
+
+    assert [a["problem_id"] for a in storage.load_attempts("ada")] == [1, 2, 3]
+    storage.flush()
+
+
+def test_storages_flush_only_their_own_buffers(tmp_path):
+    first = SimpleStorage(str(tmp_path / "first"))
+    second = SimpleStorage(str(tmp_path / "second"))
+    first.save_attempt(attempt("ada", 1))
+    second.save_attempt(attempt("ada", 2))
+
+    first.flush()
+    assert attempt_lines(tmp_path / "first" / "attempts_ada.jsonl") == [1]
+    assert not (tmp_path / "second" / "attempts_ada.jsonl").exists()
+
+    # The exit hook flushes whatever is still pending
+    SimpleStorage.flush_all()
+    assert attempt_lines(tmp_path / "second" / "attempts_ada.jsonl") == [2]
+    assert second not in SimpleStorage._pending